@@ -1,8 +1,8 @@
 """API dependencies for authentication and database sessions."""
 
-from typing import Generator
+from typing import Generator, Optional
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 
@@ -15,12 +15,30 @@ from app.db.session import get_db
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
+def get_user_by_username(db: Session, username: str) -> Optional[models.User]:
+    """Look up a user by username (a unique-index lookup).
+
+    Args:
+        db: Database session.
+        username: The username (token subject) to resolve.
+    Returns:
+        The matching user or ``None`` if it does not exist.
+    """
+    return db.query(models.User).filter(models.User.username == username).first()
+
+
 def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
 ) -> models.User:
     """Retrieve the current authenticated user based on the JWT token.
 
+    The resolved user is stored on ``request.state`` so that the token is
+    only verified once per request.
+
     Args:
+        request: The incoming request.
         token: The bearer token from the Authorization header.
         db: Database session dependency.
     Returns:
@@ -28,6 +46,9 @@ def get_current_user(
     Raises:
         HTTPException: When the token is invalid or user does not exist.
     """
+    user = getattr(request.state, "current_user", None)
+    if user is not None:
+        return user
     username = decode_access_token(token)
     if username is None:
         raise HTTPException(
@@ -35,13 +56,14 @@ def get_current_user(
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    user = db.query(models.User).filter(models.User.username == username).first()
+    user = get_user_by_username(db, username)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    request.state.current_user = user
     return user
 
 
@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
-from app.core.security import verify_password, create_access_token
+from app.core.security import verify_and_update_password, create_access_token
 from app.db import models
 from app.db.session import get_db
 from app.schemas.auth import Token
@@ -26,12 +26,21 @@ def login(
     for authenticated requests.
     """
     user = db.query(models.User).filter(models.User.username == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    valid, new_hash = (
+        verify_and_update_password(form_data.password, user.hashed_password)
+        if user
+        else (False, None)
+    )
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if new_hash:
+        # Transparently upgrade legacy hashes to the current scheme
+        user.hashed_password = new_hash
+        db.commit()
     access_token_expires = timedelta(minutes=60 * 24)
     access_token = create_access_token(
         subject=user.username, expires_delta=access_token_expires
@@ -1,6 +1,7 @@
 """Camera CRUD API endpoints."""
 
 import os
+import threading
 import time
 
 import cv2
@@ -8,18 +9,70 @@ from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import exists, update
 from sqlalchemy.orm import Session
 
 from app.api import deps
+from app.core.responses import JSONResponse
 from app.core.security import decode_access_token
 from app.db import models
 from app.db.session import get_db
 from app.schemas import camera as schema
 from app.schemas import camera_roi as roi_schema
+from app.services import response_cache
+
+try:
+    from turbojpeg import TurboJPEG, TJSAMP_420  # type: ignore
+    _JPEG = TurboJPEG()
+except Exception:
+    _JPEG = None  # Optional dependency; falls back to cv2.imencode
 
 
 router = APIRouter(prefix="/cameras", tags=["cameras"])
 
+_BOUNDARY = b"--frame\r\nContent-Type: image/jpeg\r\n\r\n"
+
+
+# Snapshot captures kept open per camera so ffmpeg probing happens only once
+_CAP_POOL: dict[int, tuple[cv2.VideoCapture, threading.Lock]] = {}
+_CAP_POOL_LOCK = threading.Lock()
+
+
+def _read_snapshot_frame(camera_id: int, video_path: str):
+    """Return the first frame of the camera's source, reusing an open capture."""
+    with _CAP_POOL_LOCK:
+        entry = _CAP_POOL.get(camera_id)
+        if entry is None:
+            cap = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG)
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            entry = _CAP_POOL[camera_id] = (cap, threading.Lock())
+    cap, lock = entry
+    with lock:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        ok, frame = cap.read()
+    if not ok:
+        # Drop the handle so the next request reopens the source
+        _release_snapshot_capture(camera_id)
+        return None
+    return frame
+
+
+def _release_snapshot_capture(camera_id: int) -> None:
+    with _CAP_POOL_LOCK:
+        entry = _CAP_POOL.pop(camera_id, None)
+    if entry is not None:
+        cap, lock = entry
+        with lock:
+            cap.release()
+
+
+def _encode_jpeg(frame) -> bytes | None:
+    """Encode a BGR frame to JPEG bytes, preferring libjpeg-turbo when available."""
+    if _JPEG is not None:
+        return _JPEG.encode(frame, quality=80, jpeg_subsample=TJSAMP_420)
+    ok, jpeg = cv2.imencode(".jpg", frame)
+    return jpeg.tobytes() if ok else None
+
 
 @router.post("/", response_model=schema.CameraOut)
 def create_camera(
@@ -28,8 +81,7 @@ def create_camera(
     _: models.User = Depends(deps.require_admin),
 ):
     """Create a new camera and attach it to a gate."""
-    gate = db.query(models.Gate).filter(models.Gate.id == camera_in.gate_id).first()
-    if not gate:
+    if not db.query(exists().where(models.Gate.id == camera_in.gate_id)).scalar():
         raise HTTPException(status_code=404, detail="Gate not found")
     camera = models.Camera(
         gate_id=camera_in.gate_id,
@@ -40,6 +92,7 @@ def create_camera(
     db.add(camera)
     db.commit()
     db.refresh(camera)
+    response_cache.invalidate("cameras")
     return camera
 
 
@@ -49,7 +102,12 @@ def list_cameras(
     _: models.User = Depends(deps.get_current_user),
 ):
     """List all cameras."""
-    return db.query(models.Camera).all()
+
+    def load():
+        cameras = schema.CAMERA_LIST_ADAPTER.validate_python(db.query(models.Camera).all(), from_attributes=True)
+        return schema.CAMERA_LIST_ADAPTER.dump_python(cameras)
+
+    return JSONResponse(response_cache.get_or_set("cameras:list", load))
 
 
 @router.get("/{camera_id}", response_model=schema.CameraOut)
@@ -59,10 +117,14 @@ def get_camera(
     _: models.User = Depends(deps.get_current_user),
 ):
     """Retrieve a single camera by its ID."""
-    camera = db.query(models.Camera).filter(models.Camera.id == camera_id).first()
-    if not camera:
-        raise HTTPException(status_code=404, detail="Camera not found")
-    return camera
+
+    def load():
+        camera = db.get(models.Camera, camera_id)
+        if not camera:
+            raise HTTPException(status_code=404, detail="Camera not found")
+        return schema.CameraOut.model_validate(camera, from_attributes=True).model_dump()
+
+    return response_cache.get_or_set(f"cameras:{camera_id}", load)
 
 
 @router.put("/{camera_id}", response_model=schema.CameraOut)
@@ -73,14 +135,23 @@ def update_camera(
     _: models.User = Depends(deps.require_admin),
 ):
     """Update an existing camera."""
-    camera = db.query(models.Camera).filter(models.Camera.id == camera_id).first()
+    data = camera_in.dict(exclude_unset=True)
+    if data:
+        stmt = (
+            update(models.Camera)
+            .where(models.Camera.id == camera_id)
+            .values(**data)
+            .returning(models.Camera)
+        )
+        camera = db.scalars(stmt, execution_options={"populate_existing": True}).one_or_none()
+    else:
+        camera = db.get(models.Camera, camera_id)
     if not camera:
         raise HTTPException(status_code=404, detail="Camera not found")
-    for attr, value in camera_in.dict(exclude_unset=True).items():
-        setattr(camera, attr, value)
+    out = schema.CameraOut.model_validate(camera, from_attributes=True)
     db.commit()
-    db.refresh(camera)
-    return camera
+    response_cache.invalidate("cameras")
+    return out
 
 
 @router.delete("/{camera_id}")
@@ -90,11 +161,14 @@ def delete_camera(
     _: models.User = Depends(deps.require_admin),
 ):
     """Delete a camera."""
-    camera = db.query(models.Camera).filter(models.Camera.id == camera_id).first()
+    camera = db.get(models.Camera, camera_id)
     if not camera:
         raise HTTPException(status_code=404, detail="Camera not found")
     db.delete(camera)
     db.commit()
+    _release_snapshot_capture(camera_id)
+    response_cache.invalidate("cameras")
+    response_cache.invalidate("rois")
     return {"detail": "Camera deleted"}
 
 
@@ -111,20 +185,17 @@ def get_snapshot(
     returns the first frame as a JPEG image. It is used by the
     frontend ROI setup screen.
     """
-    camera = db.query(models.Camera).filter(models.Camera.id == camera_id).first()
-    if not camera:
+    if not db.query(exists().where(models.Camera.id == camera_id)).scalar():
         raise HTTPException(status_code=404, detail="Camera not found")
     video_path = os.getenv("SAMPLE_VIDEO_PATH", "/sample_media/sample.mp4")
-    cap = cv2.VideoCapture(video_path)
-    ret, frame = cap.read()
-    cap.release()
-    if not ret:
+    frame = _read_snapshot_frame(camera_id, video_path)
+    if frame is None:
         raise HTTPException(status_code=500, detail="Unable to capture snapshot")
     # Encode frame to JPEG
-    ret, jpeg = cv2.imencode(".jpg", frame)
-    if not ret:
+    jpeg_bytes = _encode_jpeg(frame)
+    if jpeg_bytes is None:
         raise HTTPException(status_code=500, detail="Failed to encode snapshot")
-    return Response(content=jpeg.tobytes(), media_type="image/jpeg")
+    return Response(content=jpeg_bytes, media_type="image/jpeg")
 
 
 @router.get("/{camera_id}/mjpeg")
@@ -134,8 +205,7 @@ def mjpeg_preview(
     _: models.User = Depends(deps.get_current_user),
 ):
     """Return a simple MJPEG preview stream from the sample video (local-only)."""
-    camera = db.query(models.Camera).filter(models.Camera.id == camera_id).first()
-    if not camera:
+    if not db.query(exists().where(models.Camera.id == camera_id)).scalar():
         raise HTTPException(status_code=404, detail="Camera not found")
     video_path = os.getenv("SAMPLE_VIDEO_PATH", "/sample_media/sample.mp4")
     if not os.path.exists(video_path):
@@ -143,15 +213,27 @@ def mjpeg_preview(
 
     def gen():
         cap = cv2.VideoCapture(video_path)
+        source_fps = cap.get(cv2.CAP_PROP_FPS) or 30
+        target_fps = max(1, int(os.getenv("PREVIEW_FPS", "10")))
+        skip = max(1, round(source_fps / target_fps))
         while True:
-            ok, frame = cap.read()
+            # Advance the demuxer without decoding frames we will not emit
+            ok = True
+            for _ in range(skip - 1):
+                if not cap.grab():
+                    ok = False
+                    break
+            if ok:
+                ok = cap.grab()
+            if ok:
+                ok, frame = cap.retrieve()
             if not ok:
                 cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
                 continue
-            ok, jpeg = cv2.imencode(".jpg", frame)
-            if not ok:
+            jpeg_bytes = _encode_jpeg(frame)
+            if jpeg_bytes is None:
                 continue
-            yield (b"--frame\r\nContent-Type: image/jpeg\r\n\r\n" + jpeg.tobytes() + b"\r\n")
+            yield b"".join([_BOUNDARY, jpeg_bytes, b"\r\n"])
 
     return StreamingResponse(gen(), media_type="multipart/x-mixed-replace; boundary=frame")
 
@@ -171,10 +253,10 @@ def mjpeg_live(
     username = decode_access_token(token)
     if not username:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    user = db.query(models.User).filter(models.User.username == username).first()
+    user = deps.get_user_by_username(db, username)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-    camera = db.query(models.Camera).filter(models.Camera.id == camera_id).first()
+    camera = db.get(models.Camera, camera_id)
     if not camera:
         raise HTTPException(status_code=404, detail="Camera not found")
     rtsp_url = camera.rtsp_url
@@ -197,10 +279,10 @@ def mjpeg_live(
                 ok, frame = cap.read()
                 if not ok:
                     break
-                ok, jpeg = cv2.imencode(".jpg", frame)
-                if not ok:
+                jpeg_bytes = _encode_jpeg(frame)
+                if jpeg_bytes is None:
                     continue
-                yield (b"--frame\r\nContent-Type: image/jpeg\r\n\r\n" + jpeg.tobytes() + b"\r\n")
+                yield b"".join([_BOUNDARY, jpeg_bytes, b"\r\n"])
             cap.release()
             time.sleep(backoff)
             backoff = min(5.0, backoff * 1.5)
@@ -231,8 +313,7 @@ def upsert_camera_roi(
         raise HTTPException(status_code=400, detail="Only normalized coordinates are supported")
     if roi_in.x + roi_in.w > 1 or roi_in.y + roi_in.h > 1:
         raise HTTPException(status_code=400, detail="ROI must fit within the normalized frame")
-    camera = db.query(models.Camera).filter(models.Camera.id == camera_id).first()
-    if not camera:
+    if not db.query(exists().where(models.Camera.id == camera_id)).scalar():
         raise HTTPException(status_code=404, detail="Camera not found")
 
     roi = db.query(models.CameraROI).filter(models.CameraROI.camera_id == camera_id).first()
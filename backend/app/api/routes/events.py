@@ -5,31 +5,74 @@ from datetime import datetime
 from io import StringIO
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select, tuple_, update
 from sqlalchemy.orm import Session
 
 from app.api import deps
+from app.core.responses import JSONResponse
 from app.db import models
 from app.db.session import get_db
 from app.schemas import event as schema
+from app.services.analytics.material_base import load_label
 from datetime import datetime
 
 
 router = APIRouter(prefix="/events", tags=["events"])
 
+EXPORT_HEADER = [
+    "timestamp",
+    "gate_id",
+    "camera_id",
+    "entry_exit",
+    "vehicle_type",
+    "plate_number",
+    "barcode_value",
+    "material_type",
+    "load_percentage",
+    "snapshot_path",
+]
+EXPORT_COLUMNS = [getattr(models.Event, name) for name in EXPORT_HEADER]
 
-@router.get("/", response_model=List[schema.EventOut])
-def list_events(
-    start_date: Optional[datetime] = None,
-    end_date: Optional[datetime] = None,
-    gate_id: Optional[int] = None,
-    vehicle_type: Optional[models.VehicleType] = None,
-    entry_exit: Optional[models.EntryExit] = None,
-    db: Session = Depends(get_db),
-    _: models.User = Depends(deps.get_current_user),
+
+def _export_row(row) -> tuple:
+    """Flatten enum columns of an export row to their plain values."""
+    ts, gate_id, camera_id, entry_exit, vehicle_type, *rest = row
+    return (
+        ts,
+        gate_id,
+        camera_id,
+        entry_exit.value,
+        vehicle_type.value if vehicle_type else None,
+        *rest,
+    )
+
+
+def _update_event(db: Session, event_id: int, values: dict) -> models.Event:
+    """Apply ``values`` with a single UPDATE ... RETURNING, or raise 404."""
+    stmt = (
+        update(models.Event)
+        .where(models.Event.id == event_id)
+        .values(**values)
+        .returning(models.Event)
+    )
+    event = db.scalars(stmt, execution_options={"populate_existing": True}).one_or_none()
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    return event
+
+
+def _filter_events(
+    query,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    gate_id: Optional[int],
+    vehicle_type: Optional[models.VehicleType],
+    entry_exit: Optional[models.EntryExit],
+    load_label: Optional[str],
 ):
-    """List events with optional filters."""
-    query = db.query(models.Event)
+    """Apply the shared list/summary filters to ``query``."""
     if start_date:
         query = query.filter(models.Event.timestamp >= start_date)
     if end_date:
@@ -40,8 +83,82 @@ def list_events(
         query = query.filter(models.Event.vehicle_type == vehicle_type)
     if entry_exit:
         query = query.filter(models.Event.entry_exit == entry_exit)
-    events = query.order_by(models.Event.timestamp.desc()).all()
-    return events
+    if load_label:
+        query = query.filter(models.Event.load_label == load_label)
+    return query
+
+
+@router.get("/", response_model=List[schema.EventOut])
+def list_events(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    gate_id: Optional[int] = None,
+    vehicle_type: Optional[models.VehicleType] = None,
+    entry_exit: Optional[models.EntryExit] = None,
+    load_label: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor_ts: Optional[datetime] = None,
+    cursor_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    _: models.User = Depends(deps.get_current_user),
+):
+    """List events with optional filters, newest first.
+
+    Without ``limit`` every matching event is returned. With it, results
+    are keyset-paginated: pass the ``X-Next-Cursor-Ts`` and
+    ``X-Next-Cursor-Id`` response headers back as ``cursor_ts`` and
+    ``cursor_id`` to fetch the next page.
+    """
+    # Plain column rows (no ORM identity map or per-instance __dict__)
+    query = _filter_events(
+        select(*models.Event.__table__.c), start_date, end_date, gate_id, vehicle_type, entry_exit, load_label
+    )
+    if cursor_ts is not None and cursor_id is not None:
+        query = query.filter(tuple_(models.Event.timestamp, models.Event.id) < (cursor_ts, cursor_id))
+    events = db.execute(
+        query.order_by(models.Event.timestamp.desc(), models.Event.id.desc()).limit(limit)
+    ).all()
+    headers = {}
+    if limit is not None and len(events) == limit:
+        last = events[-1]
+        headers["X-Next-Cursor-Ts"] = last.timestamp.isoformat()
+        headers["X-Next-Cursor-Id"] = str(last.id)
+    # Validate and dump the whole page in one pydantic-core call
+    items = schema.EVENT_LIST_ADAPTER.validate_python(events, from_attributes=True)
+    return JSONResponse(schema.EVENT_LIST_ADAPTER.dump_python(items), headers=headers)
+
+
+@router.get("/summary", response_model=schema.EventSummary)
+def summarize_events(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    gate_id: Optional[int] = None,
+    vehicle_type: Optional[models.VehicleType] = None,
+    entry_exit: Optional[models.EntryExit] = None,
+    load_label: Optional[str] = None,
+    db: Session = Depends(get_db),
+    _: models.User = Depends(deps.get_current_user),
+):
+    """Counts and average load over the filtered events, for dashboard charts."""
+    filters = (start_date, end_date, gate_id, vehicle_type, entry_exit, load_label)
+    total, avg_load = db.execute(
+        _filter_events(
+            select(func.count(), func.avg(func.coalesce(models.Event.load_percentage, 0))), *filters
+        )
+    ).one()
+
+    def counts(column) -> list[dict]:
+        rows = db.execute(
+            _filter_events(select(column, func.count()), *filters).group_by(column).order_by(func.count().desc())
+        ).all()
+        return [{"name": getattr(key, "value", key) or "Unknown", "count": n} for key, n in rows]
+
+    return {
+        "total": total,
+        "avg_load": float(avg_load or 0),
+        "vehicle_types": counts(models.Event.vehicle_type),
+        "materials": counts(models.Event.material_type),
+    }
 
 
 @router.patch("/{event_id}", response_model=schema.EventOut)
@@ -52,17 +169,13 @@ def correct_event(
     user: models.User = Depends(deps.get_current_user),
 ):
     """Apply manual corrections to an event."""
-    event = db.query(models.Event).filter(models.Event.id == event_id).first()
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
     data = correction.dict(exclude_unset=True)
-    for key, value in data.items():
-        setattr(event, key, value)
     # Add audit fields
-    event.processed = True
+    data["processed"] = True
+    event = _update_event(db, event_id, data)
+    out = schema.EventOut.model_validate(event, from_attributes=True)
     db.commit()
-    db.refresh(event)
-    return event
+    return out
 
 
 @router.get("/export")
@@ -72,46 +185,32 @@ def export_events(
     db: Session = Depends(get_db),
     _: models.User = Depends(deps.get_current_user),
 ):
-    """Export events to CSV and return as a file attachment."""
-    query = db.query(models.Event)
+    """Export events to CSV and return as a file attachment.
+
+    Selects only the exported columns via SQLAlchemy Core (no ORM
+    identity map) and writes each fetched batch with ``writerows``.
+    """
+    stmt = select(*EXPORT_COLUMNS)
     if start_date:
-        query = query.filter(models.Event.timestamp >= start_date)
+        stmt = stmt.where(models.Event.timestamp >= start_date)
     if end_date:
-        query = query.filter(models.Event.timestamp <= end_date)
-    events = query.order_by(models.Event.timestamp.desc()).all()
-    output = StringIO()
-    writer = csv.writer(output)
-    writer.writerow([
-        "timestamp",
-        "gate_id",
-        "camera_id",
-        "entry_exit",
-        "vehicle_type",
-        "plate_number",
-        "barcode_value",
-        "material_type",
-        "load_percentage",
-        "snapshot_path",
-    ])
-    for e in events:
-        writer.writerow([
-            e.timestamp,
-            e.gate_id,
-            e.camera_id,
-            e.entry_exit.value,
-            e.vehicle_type.value if e.vehicle_type else None,
-            e.plate_number,
-            e.barcode_value,
-            e.material_type,
-            e.load_percentage,
-            e.snapshot_path,
-        ])
-    csv_content = output.getvalue()
-    headers = {
-        "Content-Disposition": "attachment; filename=events.csv",
-        "Content-Type": "text/csv",
-    }
-    return Response(content=csv_content, media_type="text/csv", headers=headers)
+        stmt = stmt.where(models.Event.timestamp <= end_date)
+    stmt = stmt.order_by(models.Event.timestamp.desc())
+
+    def gen():
+        buf = StringIO()
+        writer = csv.writer(buf)
+        writer.writerow(EXPORT_HEADER)
+        yield buf.getvalue()
+        result = db.execute(stmt, execution_options={"yield_per": 1000})
+        for rows in result.partitions():
+            buf.seek(0)
+            buf.truncate(0)
+            writer.writerows(map(_export_row, rows))
+            yield buf.getvalue()
+
+    headers = {"Content-Disposition": "attachment; filename=events.csv"}
+    return StreamingResponse(gen(), media_type="text/csv", headers=headers)
 
 
 @router.post("/{event_id}/tags", response_model=schema.EventOut)
@@ -122,30 +221,21 @@ def tag_event(
     user: models.User = Depends(deps.get_current_user),
 ):
     """Manually tag material/load and record editor."""
-    event = db.query(models.Event).filter(models.Event.id == event_id).first()
-    if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
+    values = {}
     if tags.material_type is not None:
-        event.material_type = tags.material_type
+        values["material_type"] = tags.material_type
     if tags.material_confidence is not None:
-        event.material_confidence = tags.material_confidence
+        values["material_confidence"] = tags.material_confidence
     if tags.load_percentage is not None:
-        event.load_percentage = tags.load_percentage
+        values["load_percentage"] = tags.load_percentage
         # update label
-        lp = float(tags.load_percentage)
-        if lp < 25:
-            event.load_label = "Empty"
-        elif lp < 50:
-            event.load_label = "Partial"
-        elif lp < 75:
-            event.load_label = "Half"
-        else:
-            event.load_label = "Full"
+        values["load_label"] = load_label(tags.load_percentage)
     if tags.load_label is not None:
-        event.load_label = tags.load_label
-    event.edited_by = user.username
-    event.edited_at = datetime.utcnow()
-    event.edit_reason = tags.edit_reason
+        values["load_label"] = tags.load_label
+    values["edited_by"] = user.username
+    values["edited_at"] = datetime.utcnow()
+    values["edit_reason"] = tags.edit_reason
+    event = _update_event(db, event_id, values)
+    out = schema.EventOut.model_validate(event, from_attributes=True)
     db.commit()
-    db.refresh(event)
-    return event
+    return out
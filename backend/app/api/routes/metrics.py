@@ -1,10 +1,13 @@
 """Basic metrics/health counters."""
 
+import time
+from io import StringIO
+
 from fastapi import APIRouter, Depends, Response
-from sqlalchemy import text
+from sqlalchemy import func, select, text
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.db.session import engine, get_db
 from app.db import models
 from app.services import metrics as m
 
@@ -23,30 +26,71 @@ def readiness(db: Session = Depends(get_db)):
     return {"status": "ok"}
 
 
+# Rendered body is reused for this many seconds across scrapes
+_METRICS_TTL_SECONDS = 2.0
+_metrics_cache = {"ts": 0.0, "body": b""}
+
+_SNAPSHOT_TEMPLATE = (
+    "# HELP vehicle_events_total Total number of vehicle events\n"
+    "# TYPE vehicle_events_total counter\n"
+    "vehicle_events_total {events}\n"
+    "# HELP cameras_total Total cameras\n"
+    "# TYPE cameras_total gauge\n"
+    "cameras_total {cameras}\n"
+    "# HELP gates_total Total gates\n"
+    "# TYPE gates_total gauge\n"
+    "gates_total {gates}\n"
+    "# HELP db_pool_checked_out Database connections currently in use\n"
+    "# TYPE db_pool_checked_out gauge\n"
+    "db_pool_checked_out {checked_out}\n"
+    "# HELP db_pool_checked_in Idle database connections in the pool\n"
+    "# TYPE db_pool_checked_in gauge\n"
+    "db_pool_checked_in {checked_in}\n"
+    "# HELP db_pool_overflow Connections opened beyond pool_size\n"
+    "# TYPE db_pool_overflow gauge\n"
+    "db_pool_overflow {overflow}\n"
+)
+
+
+def _render_metrics(db: Session) -> bytes:
+    event_count, camera_count, gate_count = db.execute(
+        select(
+            select(func.count()).select_from(models.Event).scalar_subquery(),
+            select(func.count()).select_from(models.Camera).scalar_subquery(),
+            select(func.count()).select_from(models.Gate).scalar_subquery(),
+        )
+    ).one()
+    pool = engine.pool
+    buf = StringIO()
+    buf.write(
+        _SNAPSHOT_TEMPLATE.format(
+            events=event_count,
+            cameras=camera_count,
+            gates=gate_count,
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+        )
+    )
+    # counters
+    lines = []
+    for lb, val in m.samples(m.events_total):
+        lines.append(
+            f'vehicle_events_total{{gate="{lb["gate"]}",vehicle_type="{lb["vehicle_type"]}",direction="{lb["direction"]}"}} {val:g}'
+        )
+    for lb, val in m.samples(m.notifications_sent_total):
+        lines.append(f'notifications_sent_total{{channel="{lb["channel"]}",status="{lb["status"]}"}} {val:g}')
+    for lb, val in m.samples(m.stream_errors_total):
+        lines.append(f'stream_errors_total{{camera="{lb["camera"]}"}} {val:g}')
+    buf.write("\n".join(lines))
+    return buf.getvalue().encode()
+
+
 @router.get("/prometheus")
 def prometheus_metrics(db: Session = Depends(get_db)):
     """Expose a minimal Prometheus text metrics snapshot."""
-    event_count = db.query(models.Event).count()
-    camera_count = db.query(models.Camera).count()
-    gate_count = db.query(models.Gate).count()
-    lines = []
-    # counters
-    for (gate, vtype, direction), val in m.events_total.items():
-        lines.append(f'vehicle_events_total{{gate="{gate}",vehicle_type="{vtype}",direction="{direction}"}} {val}')
-    for (channel, status), val in m.notifications_sent_total.items():
-        lines.append(f'notifications_sent_total{{channel="{channel}",status="{status}"}} {val}')
-    for cam, val in m.stream_errors_total.items():
-        lines.append(f'stream_errors_total{{camera="{cam}"}} {val}')
-    body = (
-        f"# HELP vehicle_events_total Total number of vehicle events\n"
-        f"# TYPE vehicle_events_total counter\n"
-        f"vehicle_events_total {event_count}\n"
-        f"# HELP cameras_total Total cameras\n"
-        f"# TYPE cameras_total gauge\n"
-        f"cameras_total {camera_count}\n"
-        f"# HELP gates_total Total gates\n"
-        f"# TYPE gates_total gauge\n"
-        f"gates_total {gate_count}\n"
-        + "\n".join(lines)
-    )
-    return Response(content=body, media_type="text/plain")
+    now = time.monotonic()
+    if now - _metrics_cache["ts"] >= _METRICS_TTL_SECONDS:
+        _metrics_cache["body"] = _render_metrics(db)
+        _metrics_cache["ts"] = now
+    return Response(content=_metrics_cache["body"], media_type="text/plain")
@@ -4,30 +4,43 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from app.api import deps
+from app.core.responses import JSONResponse
 from app.db import models
 from app.db.models import NotificationRule, NotificationChannel
 from app.db.session import get_db
+from app.services import notify_state, response_cache
 
 router = APIRouter(prefix="/notifications", tags=["notifications"])
 
 
+def _split_csv(value: str | None, normalize=str.strip) -> list[str] | None:
+    """Split a comma-separated form value once, at write time."""
+    if not value:
+        return None
+    items = [normalize(v.strip()) for v in value.split(",") if v.strip()]
+    return items or None
+
+
 @router.get("/", response_model=list[dict])
 def list_rules(db: Session = Depends(get_db), _: models.User = Depends(deps.require_admin)):
-    rules = db.query(NotificationRule).all()
-    return [
-        {
-            "id": r.id,
-            "gate_id": r.gate_id,
-            "project_id": r.project_id,
-            "channel": r.channel.value,
-            "enabled": r.enabled,
-            "min_confidence": r.min_confidence,
-            "directions": r.directions.split(",") if r.directions else [],
-            "vehicle_types": r.vehicle_types.split(",") if r.vehicle_types else [],
-            "recipients": r.recipient_list(),
-        }
-        for r in rules
-    ]
+    rules = response_cache.get_or_set(
+        "rules:list",
+        lambda: [
+            {
+                "id": r.id,
+                "gate_id": r.gate_id,
+                "project_id": r.project_id,
+                "channel": r.channel.value,
+                "enabled": r.enabled,
+                "min_confidence": r.min_confidence,
+                "directions": r.directions or [],
+                "vehicle_types": r.vehicle_types or [],
+                "recipients": r.recipient_list(),
+            }
+            for r in db.query(NotificationRule).all()
+        ],
+    )
+    return JSONResponse(rules)
 
 
 @router.post("/", response_model=dict)
@@ -52,30 +65,34 @@ def upsert_rule(
         rule = NotificationRule(gate_id=gate_id, channel=channel)
     rule.enabled = enabled
     rule.min_confidence = min_confidence
-    rule.recipients = recipients
+    rule.recipients = _split_csv(recipients)
     rule.project_id = project_id
-    rule.directions = directions
-    rule.vehicle_types = vehicle_types
+    rule.directions = _split_csv(directions, str.upper)
+    rule.vehicle_types = _split_csv(vehicle_types, str.lower)
     db.add(rule)
     db.commit()
     db.refresh(rule)
+    response_cache.invalidate("rules")
+    notify_state.bump_rules_version()
     return {
         "id": rule.id,
         "gate_id": rule.gate_id,
         "channel": rule.channel.value,
         "enabled": rule.enabled,
         "min_confidence": rule.min_confidence,
-        "directions": rule.directions.split(",") if rule.directions else [],
-        "vehicle_types": rule.vehicle_types.split(",") if rule.vehicle_types else [],
+        "directions": rule.directions or [],
+        "vehicle_types": rule.vehicle_types or [],
         "recipients": rule.recipient_list(),
     }
 
 
 @router.delete("/{rule_id}")
 def delete_rule(rule_id: int, db: Session = Depends(get_db), _: models.User = Depends(deps.require_admin)):
-    rule = db.query(NotificationRule).filter(NotificationRule.id == rule_id).first()
+    rule = db.get(NotificationRule, rule_id)
     if not rule:
         raise HTTPException(status_code=404, detail="Rule not found")
     db.delete(rule)
     db.commit()
+    response_cache.invalidate("rules")
+    notify_state.bump_rules_version()
     return {"detail": "deleted"}
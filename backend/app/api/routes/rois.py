@@ -1,12 +1,17 @@
 """ROI API endpoints for saving and retrieving gate regions."""
 
+from datetime import datetime
+
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import exists
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 from app.api import deps
 from app.db import models
 from app.db.session import get_db
 from app.schemas import roi as schema
+from app.services import response_cache
 
 
 router = APIRouter(prefix="/rois", tags=["rois"])
@@ -20,28 +25,36 @@ def create_roi(
 ):
     """Create or update the ROI for a gate/camera combination."""
     # Check if gate and camera exist
-    gate = db.query(models.Gate).filter(models.Gate.id == roi_in.gate_id).first()
-    camera = db.query(models.Camera).filter(models.Camera.id == roi_in.camera_id).first()
-    if not gate or not camera:
+    found = db.query(
+        exists().where(models.Gate.id == roi_in.gate_id),
+        exists().where(models.Camera.id == roi_in.camera_id),
+    ).one()
+    if not all(found):
         raise HTTPException(status_code=404, detail="Gate or camera not found")
-    # Delete existing ROI for this gate and camera
-    existing = (
-        db.query(models.ROI)
-        .filter(models.ROI.gate_id == roi_in.gate_id, models.ROI.camera_id == roi_in.camera_id)
-        .first()
-    )
-    if existing:
-        db.delete(existing)
-        db.commit()
-    roi = models.ROI(
-        gate_id=roi_in.gate_id,
-        camera_id=roi_in.camera_id,
-        shape=roi_in.shape,
-        coordinates=roi_in.coordinates,
+    # Replace any existing ROI for this gate and camera in a single statement
+    stmt = (
+        pg_insert(models.ROI)
+        .values(
+            gate_id=roi_in.gate_id,
+            camera_id=roi_in.camera_id,
+            shape=roi_in.shape,
+            coordinates=roi_in.coordinates,
+            created_at=datetime.utcnow(),
+        )
+        .on_conflict_do_update(
+            constraint="uix_gate_camera_roi",
+            set_={
+                "shape": roi_in.shape,
+                "coordinates": roi_in.coordinates,
+                "created_at": datetime.utcnow(),
+            },
+        )
+        .returning(models.ROI)
     )
-    db.add(roi)
+    roi = db.scalars(stmt, execution_options={"populate_existing": True}).one()
     db.commit()
     db.refresh(roi)
+    response_cache.invalidate("rois")
     return roi
 
 
@@ -53,11 +66,15 @@ def get_roi(
     _: models.User = Depends(deps.get_current_user),
 ):
     """Retrieve the ROI for a given gate and camera."""
-    roi = (
-        db.query(models.ROI)
-        .filter(models.ROI.gate_id == gate_id, models.ROI.camera_id == camera_id)
-        .first()
-    )
-    if not roi:
-        raise HTTPException(status_code=404, detail="ROI not found")
-    return roi
\ No newline at end of file
+
+    def load():
+        roi = (
+            db.query(models.ROI)
+            .filter(models.ROI.gate_id == gate_id, models.ROI.camera_id == camera_id)
+            .first()
+        )
+        if not roi:
+            raise HTTPException(status_code=404, detail="ROI not found")
+        return schema.ROIOut.model_validate(roi, from_attributes=True).model_dump()
+
+    return response_cache.get_or_set(f"rois:{gate_id}:{camera_id}", load)
\ No newline at end of file
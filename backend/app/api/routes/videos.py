@@ -2,14 +2,18 @@
 
 import os
 import uuid
-from typing import Iterator
+from datetime import datetime
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile, status
-from fastapi.responses import FileResponse, StreamingResponse
+import aiofiles
+import anyio
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, Response, UploadFile, status
+from fastapi.responses import FileResponse
+from sqlalchemy import select, tuple_
 from sqlalchemy.orm import Session
 
 from app.api import deps
 from app.core.config import get_settings
+from app.core.responses import JSONResponse
 from app.core.security import decode_access_token
 from app.db import models
 from app.db.session import get_db
@@ -30,6 +34,9 @@ def _resolve_user_from_request(
     request: Request,
     token: str | None,
 ) -> models.User:
+    user = getattr(request.state, "current_user", None)
+    if user is not None:
+        return user
     auth_header = request.headers.get("authorization")
     bearer = None
     if auth_header and auth_header.lower().startswith("bearer "):
@@ -40,25 +47,38 @@ def _resolve_user_from_request(
     username = decode_access_token(raw_token)
     if not username:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    user = db.query(models.User).filter(models.User.username == username).first()
+    user = deps.get_user_by_username(db, username)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    request.state.current_user = user
     return user
 
 
-def _iter_file(path: str, start: int = 0, end: int | None = None) -> Iterator[bytes]:
-    with open(path, "rb") as handle:
-        handle.seek(start)
-        remaining = end - start + 1 if end is not None else None
-        chunk_size = 1024 * 1024
-        while True:
-            read_size = chunk_size if remaining is None else min(chunk_size, remaining)
-            data = handle.read(read_size)
-            if not data:
-                break
-            if remaining is not None:
-                remaining -= len(data)
-            yield data
+class _FileRangeResponse(FileResponse):
+    """``FileResponse`` that sends only bytes ``start..end`` (inclusive).
+
+    This is still a userspace read/send loop through the event loop, not
+    sendfile; only ``VIDEO_ACCEL_REDIRECT_PREFIX`` gives zero-copy serving.
+    """
+
+    def __init__(self, path: str, start: int, end: int, **kwargs) -> None:
+        super().__init__(path, status_code=206, **kwargs)
+        self.start = start
+        self.end = end
+
+    async def __call__(self, scope, receive, send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        remaining = self.end - self.start + 1
+        async with await anyio.open_file(self.path, mode="rb") as handle:
+            await handle.seek(self.start)
+            while remaining > 0:
+                chunk = await handle.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+        if remaining > 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
 
 
 def _resolve_extension(upload: UploadFile) -> str:
@@ -89,18 +109,15 @@ async def upload_video(
     max_bytes = settings.VIDEO_MAX_SIZE_MB * 1024 * 1024
     size = 0
     try:
-        with open(target_path, "wb") as out:
-            while True:
-                chunk = await file.read(1024 * 1024)
-                if not chunk:
-                    break
+        async with aiofiles.open(target_path, "wb") as out:
+            while chunk := await file.read(1024 * 1024):
                 size += len(chunk)
                 if size > max_bytes:
                     raise HTTPException(
                         status_code=400,
                         detail=f"File too large. Max={settings.VIDEO_MAX_SIZE_MB} MB",
                     )
-                out.write(chunk)
+                await out.write(chunk)
     except HTTPException:
         if os.path.exists(target_path):
             os.remove(target_path)
@@ -129,10 +146,27 @@ async def upload_video(
 
 @router.get("/", response_model=list[schema.VideoOut])
 def list_videos(
+    limit: int | None = Query(None, ge=1, le=500),
+    cursor_ts: datetime | None = None,
+    cursor_id: int | None = None,
     db: Session = Depends(get_db),
     _: models.User = Depends(deps.get_current_user),
 ):
-    return db.query(models.Video).order_by(models.Video.created_at.desc()).all()
+    """List videos, newest first; keyset-paginated like events when ``limit`` is given."""
+    # Plain column rows (no ORM identity map or per-instance __dict__)
+    query = select(*models.Video.__table__.c)
+    if cursor_ts is not None and cursor_id is not None:
+        query = query.filter(tuple_(models.Video.created_at, models.Video.id) < (cursor_ts, cursor_id))
+    videos = db.execute(
+        query.order_by(models.Video.created_at.desc(), models.Video.id.desc()).limit(limit)
+    ).all()
+    headers = {}
+    if limit is not None and len(videos) == limit:
+        last = videos[-1]
+        headers["X-Next-Cursor-Ts"] = last.created_at.isoformat()
+        headers["X-Next-Cursor-Id"] = str(last.id)
+    items = schema.VIDEO_LIST_ADAPTER.validate_python(videos, from_attributes=True)
+    return JSONResponse(schema.VIDEO_LIST_ADAPTER.dump_python(items), headers=headers)
 
 
 @router.get("/{video_id}", response_model=schema.VideoOut)
@@ -141,7 +175,7 @@ def get_video(
     db: Session = Depends(get_db),
     _: models.User = Depends(deps.get_current_user),
 ):
-    video = db.query(models.Video).filter(models.Video.id == video_id).first()
+    video = db.get(models.Video, video_id)
     if not video:
         raise HTTPException(status_code=404, detail="Video not found")
     return video
@@ -155,12 +189,18 @@ def get_video_file(
     db: Session = Depends(get_db),
 ):
     _resolve_user_from_request(db, request, token)
-    video = db.query(models.Video).filter(models.Video.id == video_id).first()
+    video = db.get(models.Video, video_id)
     if not video:
         raise HTTPException(status_code=404, detail="Video not found")
     if not os.path.exists(video.file_path):
         raise HTTPException(status_code=404, detail="Video file missing")
 
+    settings = get_settings()
+    if settings.VIDEO_ACCEL_REDIRECT_PREFIX:
+        # Let the fronting nginx serve the file (and any Range) via sendfile
+        location = f"{settings.VIDEO_ACCEL_REDIRECT_PREFIX.rstrip('/')}/{os.path.basename(video.file_path)}"
+        return Response(headers={"X-Accel-Redirect": location}, media_type=video.mime_type)
+
     file_size = os.path.getsize(video.file_path)
     range_header = request.headers.get("range")
     if not range_header:
@@ -184,9 +224,10 @@ def get_video_file(
         "Accept-Ranges": "bytes",
         "Content-Length": str(end - start + 1),
     }
-    return StreamingResponse(
-        _iter_file(video.file_path, start=start, end=end),
-        status_code=206,
+    return _FileRangeResponse(
+        video.file_path,
+        start=start,
+        end=end,
         headers=headers,
         media_type=video.mime_type,
     )
@@ -21,9 +21,14 @@ celery_app = Celery(
 celery_app.conf.update(
     task_routes={
         "app.workers.tasks.process_camera_stream": {"queue": "streams"},
+        "app.workers.tasks.process_camera_streams": {"queue": "streams"},
+        "app.workers.tasks.emit_events": {"queue": "events"},
         "app.workers.tasks.send_notification": {"queue": "notifications"},
     },
     task_serializer="json",
     result_serializer="json",
     accept_content=["json"],
-)
\ No newline at end of file
+    worker_concurrency=settings.CELERY_WORKER_CONCURRENCY,
+    # Stream tasks never finish, so a process must not reserve a second one
+    worker_prefetch_multiplier=1,
+)
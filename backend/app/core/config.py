@@ -12,7 +12,13 @@ Important: All secrets such as database passwords or JWT keys are
 expected to come from the environment and must never be hard coded.
 """
 
+import contextlib
+import os
+import tempfile
 from functools import lru_cache
+from pathlib import Path
+
+import orjson
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -45,7 +51,7 @@ class Settings(BaseSettings):
     )
 
     database_url: str = Field(
-        default="postgresql+psycopg2://krishva:krishva@db:5432/vehicle_analytics",
+        default="postgresql+psycopg://krishva:krishva@db:5432/vehicle_analytics",
         alias="DATABASE_URL",
     )
 
@@ -53,6 +59,10 @@ class Settings(BaseSettings):
 
     celery_broker_url: str = Field(default="redis://redis:6379/0", alias="CELERY_BROKER_URL")
     celery_result_backend: str = Field(default="redis://redis:6379/0", alias="CELERY_RESULT_BACKEND")
+    # Stream tasks per prefork worker (each holds its cameras for the task's lifetime)
+    CELERY_WORKER_CONCURRENCY: int = Field(default=8)
+    # Threads in the I/O-bound notification worker (SMTP/SMS/push calls)
+    CELERY_NOTIFY_CONCURRENCY: int = Field(default=50)
 
     # App
     ENV: str = Field(default="development")
@@ -62,12 +72,21 @@ class Settings(BaseSettings):
     # Security / Auth
     SECRET_KEY: str = Field(default="change-me")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=60 * 24)
+    BCRYPT_ROUNDS: int = Field(default=12, ge=4, le=31, description="bcrypt cost factor for new password hashes")
 
     # Database / Redis
     DATABASE_URL: str = Field(
-        default="postgresql+psycopg2://postgres:postgres@db:5432/vehicle_analytics"
+        default="postgresql+psycopg://postgres:postgres@db:5432/vehicle_analytics"
     )
     REDIS_URL: str = Field(default="redis://redis:6379/0")
+    SLOW_QUERY_MS: int = Field(default=0, description="Log statements slower than this (0 disables)")
+    # Per engine: every API/worker process has a sync and an async engine, so
+    # each can hold up to 2 * (size + overflow) connections against
+    # Postgres' default max_connections=100
+    DB_POOL_SIZE: int = Field(default=5)
+    DB_MAX_OVERFLOW: int = Field(default=10)
+    DB_POOL_RECYCLE: int = Field(default=1800, description="Seconds before a pooled connection is replaced")
+    DB_POOL_PRE_PING: bool = Field(default=True)
 
     # MinIO
     MINIO_ENDPOINT: str = Field(default="minio:9000")
@@ -80,6 +99,9 @@ class Settings(BaseSettings):
     YOLO_MODEL_PATH: str = Field(default="/models/yolov8n.onnx")
     PLATE_MODEL_PATH: str = Field(default="/models/plate.onnx")
     PLATE_CONF: float = Field(default=0.35)
+    # Optional ONNX CTC plate recognizer; tesseract is used when unset
+    PLATE_OCR_MODEL_PATH: str | None = Field(default=None)
+    PLATE_OCR_CHARSET: str = Field(default="0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ")
 
     # Material/load models (optional ONNX)
     MATERIAL_MODEL_PATH: str | None = Field(default=None)
@@ -87,8 +109,33 @@ class Settings(BaseSettings):
 
     # Identification: ANPR | BARCODE | BOTH
     IDENT_MODE: str = Field(default="ANPR")
-
-    DETECTION_BACKEND: str = Field(default="local")  # local|jetson
+    # Reuse a track's plate/barcode read for up to this many frames
+    OCR_CACHE_FRAMES: int = Field(default=150)
+
+    # local|cuda|jetson; "cuda" decodes camera video on the GPU (cv2.cudacodec)
+    DETECTION_BACKEND: str = Field(default="local")
+    # Frames skipped between detector passes (0 = detect on every frame).
+    # Skipping saves decode and inference time but lets fast vehicles move
+    # further between detections, so they can jump the ROI midline and be
+    # missed or miscounted; verify event counts before raising it.
+    DETECT_FRAME_SKIP: int = Field(default=0)
+    # Cameras handled by one stream task, their frames detected as one batch
+    DETECT_BATCH_SIZE: int = Field(default=4)
+    # ONNX Runtime execution providers in priority order; ones the installed
+    # onnxruntime build lacks are skipped and CPU is always the fallback
+    ONNX_PROVIDERS: list[str] = Field(
+        default_factory=lambda: [
+            "OpenVINOExecutionProvider",
+            "CUDAExecutionProvider",
+            "DmlExecutionProvider",
+            "CPUExecutionProvider",
+        ]
+    )
+    # OpenVINO target device; CPU by default since most hosts have no Intel
+    # GPU, set GPU_FP16/NPU where one is present
+    OPENVINO_DEVICE_TYPE: str = Field(default="CPU_FP32")
+    # Compiled OpenVINO models are cached here across worker restarts (empty disables)
+    OPENVINO_CACHE_DIR: str | None = Field(default="/var/cache/ov")
 
     # CORS / security
     ALLOWED_ORIGINS: list[str] = Field(default_factory=lambda: ["http://localhost:5173", "http://127.0.0.1:5173"])
@@ -110,6 +157,43 @@ class Settings(BaseSettings):
     # Video uploads
     VIDEO_UPLOAD_DIR: str = Field(default="/app/uploads/videos")
     VIDEO_MAX_SIZE_MB: int = Field(default=300)
+    # Internal nginx location mapped to VIDEO_UPLOAD_DIR; when set, video files
+    # are handed off with X-Accel-Redirect instead of being streamed by the API.
+    # Off by default: the shipped frontend calls the API directly, not through
+    # nginx, so unset the API streams files itself (no sendfile).
+    VIDEO_ACCEL_REDIRECT_PREFIX: str | None = Field(default=None)
+
+    @classmethod
+    def from_cache(cls, path: str | os.PathLike) -> "Settings":
+        """Load settings previously written by :meth:`write_cache`.
+
+        Values were validated when the cache was written, so they are
+        loaded with ``model_construct`` and skip ``.env`` parsing and
+        validation entirely.
+        """
+        settings = cls.model_construct()
+        # Assigned by field name: several lowercase fields use the uppercase
+        # name of another field as their alias, so aliases cannot round-trip.
+        settings.__dict__.update(orjson.loads(Path(path).read_bytes()))
+        return settings
+
+    def write_cache(self, path: str | os.PathLike) -> None:
+        """Persist validated settings for :meth:`from_cache`.
+
+        The file holds credentials, so it is created owner-only (0600), and
+        it is written to a temporary file that is renamed into place so a
+        process starting concurrently never reads a partial file.
+        """
+        target = Path(path)
+        fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.")  # mode 0600
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(orjson.dumps(self.model_dump()))
+            os.replace(tmp_path, target)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
+            raise
 
 
 @lru_cache()
@@ -118,6 +202,25 @@ def get_settings() -> Settings:
 
     Using a cached settings instance ensures that environment variables
     are only read once and consistent across the application lifetime.
+
+    When ``SETTINGS_CACHE`` names a file, settings are loaded from it
+    without validation; if the file does not exist yet it is written from
+    the environment. Delete the file (or rebuild the image) after changing
+    configuration.
     """
 
+    cache_path = os.environ.get("SETTINGS_CACHE")
+    if cache_path:
+        if os.path.exists(cache_path):
+            try:
+                return Settings.from_cache(cache_path)
+            except (OSError, ValueError) as exc:  # unreadable or corrupt (orjson errors are ValueErrors)
+                print(f"Ignoring settings cache {cache_path}: {exc}")
+                return Settings()
+        settings = Settings()
+        try:
+            settings.write_cache(cache_path)
+        except OSError as exc:
+            print(f"Could not write settings cache {cache_path}: {exc}")
+        return settings
     return Settings()
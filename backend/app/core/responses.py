@@ -0,0 +1,23 @@
+"""Shared response classes for the API.
+
+``JSONResponse`` below is installed as FastAPI's default response class and
+used directly by routes that serialise lists themselves. It renders with
+orjson; OPT_NAIVE_UTC is a backstop for naive datetimes outside the
+response schemas, whose timestamp fields are already UTC-aware
+(``app.schemas.common.UTCDateTime``).
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+
+class JSONResponse(ORJSONResponse):
+    """orjson response that serialises naive datetimes and numpy values."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            option=orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        )
@@ -1,26 +1,59 @@
 """Security utilities for password hashing and JWT handling.
 
 This module provides functions to securely hash passwords using
-``passlib`` and to generate and verify JWT tokens via ``python-jose``.
+``passlib`` and to generate and verify HS256 JWT tokens.
 
 Usage:
     from app.core.security import get_password_hash, verify_password, create_access_token
 
-Passwords are hashed using the Bcrypt algorithm. The JWT token
-generation uses the secret and algorithm defined in settings.
+Passwords are hashed using the Bcrypt algorithm. Tokens are signed with
+HMAC-SHA256 using the secret defined in settings; the key and the encoded
+JOSE header are prepared once at import so issuing or checking a token is a
+single HMAC plus a small JSON encode/decode.
 """
 
+import base64
+import binascii
+import hmac
+import time
 from datetime import datetime, timedelta
-from typing import Any, Optional
+from hashlib import sha256
+from typing import Any, Optional, Tuple
 
-from jose import JWTError, jwt
+import orjson
 from passlib.context import CryptContext
 
 from app.core.config import get_settings
 
 
-# Password hashing context using Bcrypt
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+# base64url('{"alg":"HS256","typ":"JWT"}') -- byte-identical to what
+# python-jose produced, so previously issued tokens keep verifying.
+_HEADER_B64 = b"eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9"
+_SIGNER = hmac.new(get_settings().SECRET_KEY.encode(), digestmod=sha256)
+
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+def _sign(signing_input: bytes) -> bytes:
+    mac = _SIGNER.copy()
+    mac.update(signing_input)
+    return mac.digest()
+
+
+# Password hashing context using Bcrypt (C extension). Legacy pbkdf2_sha256
+# hashes still verify and are marked deprecated so they get rehashed on next
+# login; hashes with a different cost factor are rehashed the same way.
+pwd_context = CryptContext(
+    schemes=["bcrypt", "pbkdf2_sha256"],
+    deprecated="auto",
+    bcrypt__rounds=get_settings().BCRYPT_ROUNDS,
+)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -35,6 +68,22 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """Verify a password and return a replacement hash if it is outdated.
+
+    Args:
+        plain_password: The unhashed user-provided password.
+        hashed_password: The stored hashed password.
+    Returns:
+        Tuple of (matches, new_hash). ``new_hash`` is only set when the
+        password matches and the stored hash uses a deprecated scheme or
+        cost factor.
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
 def get_password_hash(password: str) -> str:
     """Hash a plaintext password using Bcrypt.
 
@@ -59,16 +108,14 @@ def create_access_token(
     Returns:
         A signed JWT token as a string.
     """
-    settings = get_settings()
-    if expires_delta is not None:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-
-    payload = {"exp": expire, "sub": str(subject)}
-    encoded_jwt = jwt.encode(payload, settings.SECRET_KEY, algorithm="HS256")
-    return encoded_jwt
+    if expires_delta is None:
+        expires_delta = timedelta(minutes=get_settings().ACCESS_TOKEN_EXPIRE_MINUTES)
+    expire = datetime.utcnow() + expires_delta
 
+    # Same claim encoding as before: exp as integer seconds since the epoch
+    payload = {"exp": int((expire - datetime(1970, 1, 1)).total_seconds()), "sub": str(subject)}
+    signing_input = _HEADER_B64 + b"." + _b64encode(orjson.dumps(payload))
+    return (signing_input + b"." + _b64encode(_sign(signing_input))).decode("ascii")
 
 
 def decode_access_token(token: str) -> Optional[str]:
@@ -79,9 +126,20 @@ def decode_access_token(token: str) -> Optional[str]:
     Returns:
         The subject (user identifier) if valid, otherwise None.
     """
-    settings = get_settings()
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
-        return payload.get("sub")
-    except JWTError:
-        return None
\ No newline at end of file
+        raw = token.encode("ascii")
+        signing_input, _, signature = raw.rpartition(b".")
+        header_b64, _, payload_b64 = signing_input.partition(b".")
+        if not hmac.compare_digest(_sign(signing_input), _b64decode(signature)):
+            return None
+        if header_b64 != _HEADER_B64 and orjson.loads(_b64decode(header_b64)).get("alg") != "HS256":
+            return None
+        payload = orjson.loads(_b64decode(payload_b64))
+    except (ValueError, binascii.Error, orjson.JSONDecodeError, AttributeError):
+        return None
+    if not isinstance(payload, dict):
+        return None
+    exp = payload.get("exp")
+    if exp is not None and (not isinstance(exp, (int, float)) or exp <= time.time()):
+        return None
+    return payload.get("sub")
\ No newline at end of file
@@ -7,7 +7,6 @@ lazy-loading where appropriate to avoid N+1 queries.
 """
 
 import enum
-import uuid
 from datetime import datetime
 
 from sqlalchemy import (
@@ -19,17 +18,33 @@ from sqlalchemy import (
     Numeric,
     String,
     Boolean,
-    JSON,
+    Index,
     UniqueConstraint,
     Text,
     Float,
+    func,
+    text,
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
 from sqlalchemy.orm import declarative_base, relationship
 
 
 Base = declarative_base()
 
+# Server-side default for naive UTC timestamp columns, independent of the
+# session time zone. Columns keep the Python-side default too, so ORM inserts
+# still populate them on tables created before the server default existed.
+_UTC_NOW = func.timezone("utc", func.now())
+
+
+def _enum_column_type(enum_cls: type[enum.Enum]) -> Enum:
+    """Store an enum as VARCHAR plus a CHECK constraint.
+
+    Member names are persisted exactly as the former native Postgres enum
+    types did; ``app.db.schema`` converts existing columns in place.
+    """
+    return Enum(enum_cls, native_enum=False, create_constraint=True, length=16)
+
 
 class Role(str, enum.Enum):
     """User roles supported by the system."""
@@ -58,19 +73,19 @@ class VehicleType(str, enum.Enum):
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     username = Column(String(50), unique=True, nullable=False)
     hashed_password = Column(String(128), nullable=False)
-    role = Column(Enum(Role), nullable=False, default=Role.admin)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    role = Column(_enum_column_type(Role), nullable=False, default=Role.admin)
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=_UTC_NOW, nullable=False)
 
 
 class Project(Base):
     __tablename__ = "projects"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     name = Column(String(100), unique=True, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=_UTC_NOW, nullable=False)
 
     gates = relationship("Gate", back_populates="project", cascade="all, delete-orphan")
 
@@ -84,12 +99,12 @@ class Gate(Base):
     __tablename__ = "gates"
     __table_args__ = (UniqueConstraint("project_id", "name", name="uix_project_gate"),)
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
     name = Column(String(100), nullable=False)
     anpr_enabled = Column(Boolean, default=True)
     barcode_enabled = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=_UTC_NOW, nullable=False)
 
     project = relationship("Project", back_populates="gates")
     cameras = relationship("Camera", back_populates="gate", cascade="all, delete-orphan")
@@ -100,13 +115,13 @@ class Camera(Base):
     __tablename__ = "cameras"
     __table_args__ = (UniqueConstraint("gate_id", "name", name="uix_gate_camera"),)
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     gate_id = Column(Integer, ForeignKey("gates.id"), nullable=False)
     name = Column(String(100), nullable=False)
     rtsp_url = Column(String(500), nullable=False)
     is_active = Column(Boolean, default=True)
     last_seen = Column(DateTime)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=_UTC_NOW, nullable=False)
 
     gate = relationship("Gate", back_populates="cameras")
     rois = relationship("ROI", back_populates="camera", cascade="all, delete-orphan")
@@ -117,12 +132,12 @@ class ROI(Base):
     __tablename__ = "rois"
     __table_args__ = (UniqueConstraint("gate_id", "camera_id", name="uix_gate_camera_roi"),)
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     gate_id = Column(Integer, ForeignKey("gates.id"), nullable=False)
     camera_id = Column(Integer, ForeignKey("cameras.id"), nullable=False)
     shape = Column(String(20), default="polygon")  # rectangle or polygon
-    coordinates = Column(JSON, nullable=False)  # list of points [[x,y], ...]
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    coordinates = Column(JSONB, nullable=False)  # list of points [[x,y], ...]
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=_UTC_NOW, nullable=False)
 
     gate = relationship("Gate", back_populates="rois")
     camera = relationship("Camera", back_populates="rois")
@@ -131,7 +146,7 @@ class ROI(Base):
 class CameraROI(Base):
     __tablename__ = "camera_rois"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     camera_id = Column(Integer, ForeignKey("cameras.id"), unique=True, nullable=False)
     roi_x = Column(Float, nullable=False)
     roi_y = Column(Float, nullable=False)
@@ -147,13 +162,14 @@ class CameraROI(Base):
 class Event(Base):
     __tablename__ = "events"
 
-    id = Column(Integer, primary_key=True, index=True)
-    event_uuid = Column(UUID(as_uuid=True), default=uuid.uuid4, unique=True, nullable=False)
-    timestamp = Column(DateTime, default=datetime.utcnow, index=True, nullable=False)
+    id = Column(Integer, primary_key=True)
+    # uuid_generate_v7() is created by app.db.schema.create_schema
+    event_uuid = Column(UUID(as_uuid=True), server_default=text("uuid_generate_v7()"), unique=True, nullable=False)
+    timestamp = Column(DateTime, default=datetime.utcnow, server_default=_UTC_NOW, nullable=False)
     gate_id = Column(Integer, ForeignKey("gates.id"), nullable=False)
     camera_id = Column(Integer, ForeignKey("cameras.id"), nullable=False)
-    entry_exit = Column(Enum(EntryExit), nullable=False)
-    vehicle_type = Column(Enum(VehicleType), nullable=True)
+    entry_exit = Column(_enum_column_type(EntryExit), nullable=False)
+    vehicle_type = Column(_enum_column_type(VehicleType), nullable=True)
     track_id = Column(Integer, nullable=True)
     confidence = Column(Numeric(5, 2), nullable=True)
     plate_number = Column(String(50), nullable=True)
@@ -168,36 +184,48 @@ class Event(Base):
     edited_by = Column(String(64), nullable=True)
     edited_at = Column(DateTime, nullable=True)
     edit_reason = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=_UTC_NOW, nullable=False)
 
     camera = relationship("Camera", back_populates="events")
     gate = relationship("Gate")
 
+    # Match the list/export filters, which always order by (timestamp, id) DESC
+    __table_args__ = (
+        Index("ix_events_ts_id", timestamp.desc(), id.desc()),
+        Index("ix_events_gate_ts", "gate_id", timestamp.desc(), id.desc()),
+        Index("ix_events_vtype_ts", "vehicle_type", timestamp.desc(), id.desc()),
+        Index("ix_events_load_label", "load_label"),
+    )
+
 
 class NotificationRule(Base):
+    """Per-gate notification rule.
+
+    ``directions``, ``vehicle_types`` and ``recipients`` are native text
+    arrays, normalised when the rule is saved.
+    """
+
     __tablename__ = "notification_rules"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     gate_id = Column(Integer, nullable=False)
     project_id = Column(Integer, nullable=True)
-    channel = Column(Enum(NotificationChannel), nullable=False, default=NotificationChannel.email)
+    channel = Column(_enum_column_type(NotificationChannel), nullable=False, default=NotificationChannel.email)
     enabled = Column(Boolean, default=True, nullable=False)
     min_confidence = Column(Integer, default=0, nullable=False)
-    directions = Column(String(32), nullable=True)  # comma list of ENTRY/EXIT
-    vehicle_types = Column(String(128), nullable=True)  # comma list
-    recipients = Column(String(512), nullable=True)  # comma-separated
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    directions = Column(ARRAY(String(16)), nullable=True)  # upper-case ENTRY/EXIT
+    vehicle_types = Column(ARRAY(String(32)), nullable=True)  # lower-case VehicleType values
+    recipients = Column(ARRAY(String(255)), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=_UTC_NOW, nullable=False)
 
     def recipient_list(self):
-        if not self.recipients:
-            return []
-        return [r.strip() for r in self.recipients.split(",") if r.strip()]
+        return self.recipients or []
 
 
 class Video(Base):
     __tablename__ = "videos"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     title = Column(String(200), nullable=False)
     description = Column(Text, nullable=True)
     file_path = Column(String(500), nullable=False)
@@ -205,6 +233,6 @@ class Video(Base):
     size_bytes = Column(Integer, nullable=False)
     status = Column(String(32), nullable=True)
     uploaded_by_id = Column(Integer, ForeignKey("users.id"), nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=_UTC_NOW, nullable=False)
 
     uploaded_by = relationship("User")
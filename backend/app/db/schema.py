@@ -0,0 +1,144 @@
+"""Idempotent schema bootstrap.
+
+The project has no migration tool: ``create_all`` creates missing tables
+but never alters existing ones. ``create_schema`` also runs the DDL the
+current models rely on for tables created by earlier versions. Every step
+checks the live catalog first, so it is safe to run on each start.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from app.db import models
+
+
+# Serialises concurrent bootstraps (e.g. several API workers starting at once)
+_BOOTSTRAP_LOCK_KEY = 4_815_162_342
+
+# Time-ordered UUIDv7 built from gen_random_uuid() (PostgreSQL 13+): the first
+# 48 bits become the Unix time in ms and the version nibble is set to 7, so
+# new event_uuid values append to the unique index instead of landing on
+# random pages.
+_UUID_V7_FUNCTION = text(
+    """
+    CREATE OR REPLACE FUNCTION uuid_generate_v7() RETURNS uuid AS $$
+        SELECT encode(
+            set_bit(
+                set_bit(
+                    overlay(
+                        uuid_send(gen_random_uuid())
+                        PLACING substring(int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint) FROM 3)
+                        FROM 1 FOR 6
+                    ),
+                    52, 1
+                ),
+                53, 1
+            ),
+            'hex'
+        )::uuid
+    $$ LANGUAGE sql VOLATILE
+    """
+)
+
+
+def _column_info(conn: Connection, table: str, column: str):
+    """Return ``(data_type, column_default)`` for a column, or None if missing."""
+    return conn.execute(
+        text(
+            "SELECT data_type, column_default FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND table_name = :table AND column_name = :column"
+        ),
+        {"table": table, "column": column},
+    ).first()
+
+
+def _upgrade_event_uuid(conn: Connection) -> None:
+    info = _column_info(conn, "events", "event_uuid")
+    if info is not None and "uuid_generate_v7" not in (info.column_default or ""):
+        conn.execute(text("ALTER TABLE events ALTER COLUMN event_uuid SET DEFAULT uuid_generate_v7()"))
+
+
+def _upgrade_rule_lists(conn: Connection) -> None:
+    # Comma-separated strings from before the columns became text arrays,
+    # normalised the same way the notifications route now writes them
+    for column, sql_type, normalize in (
+        ("directions", "varchar(16)[]", "upper"),
+        ("vehicle_types", "varchar(32)[]", "lower"),
+        ("recipients", "varchar(255)[]", ""),
+    ):
+        info = _column_info(conn, "notification_rules", column)
+        if info is None or info.data_type == "ARRAY":
+            continue
+        conn.execute(
+            text(
+                f"ALTER TABLE notification_rules ALTER COLUMN {column} TYPE {sql_type} "
+                f"USING NULLIF(array_remove(string_to_array({normalize}(replace({column}, ' ', '')), ','), ''), '{{}}')"
+            )
+        )
+
+
+def _upgrade_enum_columns(conn: Connection) -> None:
+    # Native Postgres enum types from before enums were stored as VARCHAR plus
+    # a CHECK constraint; the stored member names carry over unchanged
+    for table, column in (
+        ("users", "role"),
+        ("events", "entry_exit"),
+        ("events", "vehicle_type"),
+        ("notification_rules", "channel"),
+    ):
+        info = _column_info(conn, table, column)
+        if info is None or info.data_type != "USER-DEFINED":
+            continue
+        enum_type = models.Base.metadata.tables[table].c[column].type
+        allowed = ", ".join(f"'{name}'" for name in enum_type.enums)
+        conn.execute(
+            text(
+                f"ALTER TABLE {table} ALTER COLUMN {column} TYPE varchar({enum_type.length}) USING {column}::text, "
+                f"ADD CONSTRAINT {enum_type.name} CHECK ({column} IN ({allowed}))"
+            )
+        )
+        conn.execute(text(f"DROP TYPE IF EXISTS {enum_type.name}"))
+
+
+def _upgrade_roi_coordinates(conn: Connection) -> None:
+    info = _column_info(conn, "rois", "coordinates")
+    if info is not None and info.data_type == "json":
+        conn.execute(text("ALTER TABLE rois ALTER COLUMN coordinates TYPE jsonb USING coordinates::jsonb"))
+
+
+def _upgrade_event_indexes(conn: Connection) -> None:
+    # Single-column indexes that duplicated the primary keys, and the plain
+    # events.timestamp index superseded by ix_events_ts_id
+    for table in models.Base.metadata.tables:
+        conn.execute(text(f"DROP INDEX IF EXISTS ix_{table}_id"))
+    conn.execute(text("DROP INDEX IF EXISTS ix_events_timestamp"))
+    # Composites built before they gained the id DESC keyset tie-break
+    for name in ("ix_events_gate_ts", "ix_events_vtype_ts"):
+        indexdef = conn.scalar(
+            text("SELECT indexdef FROM pg_indexes WHERE schemaname = current_schema() AND indexname = :name"),
+            {"name": name},
+        )
+        if indexdef is not None and "id DESC" not in indexdef:
+            conn.execute(text(f"DROP INDEX {name}"))
+    for index in models.Event.__table__.indexes:
+        index.create(conn, checkfirst=True)
+
+
+_UPGRADES = [
+    _upgrade_event_uuid,
+    _upgrade_rule_lists,
+    _upgrade_enum_columns,
+    _upgrade_roi_coordinates,
+    _upgrade_event_indexes,
+]
+
+
+def create_schema(engine: Engine) -> None:
+    """Create missing tables and bring existing ones up to the current models."""
+    with engine.begin() as conn:
+        conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _BOOTSTRAP_LOCK_KEY})
+        # Functions referenced by column defaults must exist before CREATE TABLE
+        conn.execute(_UUID_V7_FUNCTION)
+        models.Base.metadata.create_all(bind=conn)
+        for upgrade in _UPGRADES:
+            upgrade(conn)
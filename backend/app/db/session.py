@@ -2,12 +2,18 @@
 
 This module provides synchronous and asynchronous SQLAlchemy engines and
 session factories. Using async is optional; for simplicity the core
-application uses synchronous sessions via the ``SessionLocal`` factory.
+application uses synchronous sessions via the ``SessionLocal`` factory
+(psycopg 3). Async routes can depend on ``get_async_db`` instead, which
+runs on asyncpg against the same database.
 
 Alembic migrations operate against the synchronous engine defined here.
 """
 
-from sqlalchemy import create_engine
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import get_settings
@@ -16,11 +22,47 @@ from app.core.config import get_settings
 settings = get_settings()
 
 # Create synchronous engine and session factory
+# LIFO checkout keeps a small set of warm connections in use instead of
+# rotating through the whole pool. pool_recycle retires old connections and
+# pre-ping (on by default) transparently replaces ones the server or a
+# proxy dropped, instead of failing the request.
 engine = create_engine(
-    settings.database_url, pool_pre_ping=True
+    settings.database_url,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_use_lifo=True,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    connect_args={"options": "-c timezone=utc"},
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine on asyncpg; connections are only opened once an async route
+# actually uses it.
+async_engine = create_async_engine(
+    make_url(settings.database_url).set(drivername="postgresql+asyncpg"),
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_use_lifo=True,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    connect_args={"server_settings": {"timezone": "utc"}},
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+if settings.SLOW_QUERY_MS > 0:
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _log_slow_query(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["query_start"].pop()) * 1000
+        if elapsed_ms >= settings.SLOW_QUERY_MS:
+            print(f"[db] slow query ({elapsed_ms:.1f} ms): {statement}")
+
 
 def get_db():
     """FastAPI dependency that yields a database session and closes it.
@@ -32,4 +74,13 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    """FastAPI dependency that yields an ``AsyncSession`` and closes it.
+
+    Yields:
+        A SQLAlchemy async session.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -7,25 +7,99 @@ The application mounts a health check endpoint at ``/health`` and
 provides automatic OpenAPI documentation at ``/docs``.
 """
 
+import asyncio
+import time
+from functools import lru_cache
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from sqlalchemy import text
 
 from app.api.routes import auth, cameras, rois, events, notifications, metrics, videos
-from app.db import models
-from app.db.session import engine
+from app.db.schema import create_schema
+from app.db.session import async_engine, engine
 from app.core.config import get_settings
-from app.services.storage.minio_client import MinioService
-import redis
+from app.core.responses import JSONResponse
+
+
+# Media endpoints (JPEG/MJPEG/video) are already compressed; gzipping them
+# would buffer live streams and break byte-range requests.
+_UNCOMPRESSED_SUFFIXES = ("/snapshot", "/mjpeg", "/mjpeg_live", "/file")
+
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """GZip JSON/CSV API responses while passing media streams through."""
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http" and scope["path"].rstrip("/").endswith(_UNCOMPRESSED_SUFFIXES):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+# Probe results are reused for this many seconds so frequent liveness
+# probes do not each round-trip to every dependency.
+_HEALTH_TTL_SECONDS = 2.0
+_HEALTH_PROBE_TIMEOUT_SECONDS = 0.5
+_health_cache = {"ts": 0.0, "body": None}
+
+
+@lru_cache(maxsize=1)
+def _redis_client():
+    import redis.asyncio as aioredis
+
+    return aioredis.Redis.from_url(get_settings().redis_url)
+
+
+async def _probe_db() -> None:
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def _probe_redis() -> None:
+    await _redis_client().ping()
+
+
+async def _probe_minio() -> None:
+    def check() -> None:
+        from app.services.storage.minio_client import get_minio
+
+        m = get_minio()
+        m.client.bucket_exists(m.bucket)
+
+    await asyncio.to_thread(check)
+
+
+async def _check_health() -> dict:
+    """Run all dependency probes concurrently, each with its own timeout."""
+    probes = {"db": _probe_db(), "redis": _probe_redis(), "minio": _probe_minio()}
+    results = await asyncio.gather(
+        *(asyncio.wait_for(p, _HEALTH_PROBE_TIMEOUT_SECONDS) for p in probes.values()),
+        return_exceptions=True,
+    )
+    status = {}
+    for name, result in zip(probes, results):
+        if isinstance(result, asyncio.TimeoutError):
+            status[name] = "error: timed out"
+        elif isinstance(result, Exception):
+            status[name] = f"error: {result}"
+        else:
+            status[name] = "ok"
+    overall = "ok" if all(v == "ok" for v in status.values()) else "degraded"
+    return {"status": overall, "components": status}
 
 
 def create_app() -> FastAPI:
     """Construct and configure the FastAPI application."""
-    app = FastAPI(title="CCTV Vehicle Analytics API")
+    app = FastAPI(title="CCTV Vehicle Analytics API", default_response_class=JSONResponse)
     settings = get_settings()
 
-    # Create database tables if they do not exist
-    models.Base.metadata.create_all(bind=engine)
+    # Create database tables if they do not exist. Production schemas are
+    # bootstrapped once by ``app.initial_data`` rather than by every worker;
+    # the image's CMD and the compose command run it before uvicorn starts.
+    if settings.ENV != "production":
+        create_schema(engine)
 
     # CORS configuration
     app.add_middleware(
@@ -34,31 +108,18 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor-Ts", "X-Next-Cursor-Id"],
     )
+    app.add_middleware(SelectiveGZipMiddleware, minimum_size=1024, compresslevel=5)
 
     @app.get("/health", tags=["health"])
-    def health_check() -> dict[str, str]:
+    async def health_check() -> dict[str, str]:
         """Return a basic health status with dependencies."""
-        status = {"db": "ok", "redis": "ok", "minio": "ok"}
-        try:
-            # DB check
-            with engine.connect() as conn:
-                conn.execute(text("SELECT 1"))
-        except Exception as exc:
-            status["db"] = f"error: {exc}"
-        try:
-            cfg = get_settings()
-            r = redis.Redis.from_url(cfg.redis_url)
-            r.ping()
-        except Exception as exc:
-            status["redis"] = f"error: {exc}"
-        try:
-            m = MinioService()
-            m.client.bucket_exists(m.bucket)
-        except Exception as exc:
-            status["minio"] = f"error: {exc}"
-        overall = "ok" if all(v == "ok" for v in status.values()) else "degraded"
-        return {"status": overall, "components": status}
+        now = time.monotonic()
+        if now - _health_cache["ts"] >= _HEALTH_TTL_SECONDS:
+            _health_cache["body"] = await _check_health()
+            _health_cache["ts"] = now
+        return _health_cache["body"]
 
     # Include routers
     app.include_router(auth.router)
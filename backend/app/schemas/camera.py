@@ -1,9 +1,10 @@
 """Schemas for camera CRUD operations."""
 
-from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, Field, AnyHttpUrl
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, AnyHttpUrl
+
+from app.schemas.common import UTCDateTime
 
 
 class CameraBase(BaseModel):
@@ -25,8 +26,11 @@ class CameraUpdate(BaseModel):
 class CameraOut(CameraBase):
     id: int
     gate_id: int
-    last_seen: Optional[datetime]
-    created_at: datetime
+    last_seen: Optional[UTCDateTime]
+    created_at: UTCDateTime
+
+    model_config = ConfigDict(from_attributes=True)
+
 
-    class Config:
-        orm_mode = True
\ No newline at end of file
+# Built once and reused by list endpoints instead of per request
+CAMERA_LIST_ADAPTER = TypeAdapter(list[CameraOut])
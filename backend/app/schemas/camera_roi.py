@@ -1,9 +1,10 @@
 """Schemas for camera ROI configuration."""
 
-from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.schemas.common import UTCDateTime
 
 
 class CameraROIBase(BaseModel):
@@ -13,16 +14,13 @@ class CameraROIBase(BaseModel):
     h: float = Field(..., gt=0, le=1, alias="roi_h")
     coordinate_type: str = Field(default="normalized")
 
-    class Config:
-        allow_population_by_field_name = True
+    model_config = ConfigDict(populate_by_name=True)
 
 
 class CameraROIOut(CameraROIBase):
     id: int
     camera_id: int
     updated_by_id: Optional[int] = None
-    updated_at: datetime
+    updated_at: UTCDateTime
 
-    class Config:
-        orm_mode = True
-        allow_population_by_field_name = True
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
@@ -0,0 +1,20 @@
+"""Field types shared by the response schemas."""
+
+from datetime import datetime, timezone
+from typing import Annotated
+
+from pydantic import AfterValidator, PlainSerializer
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Columns hold naive utcnow() values; tag them instead of shifting them
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+# Output timestamps serialise as ISO 8601 with an explicit +00:00 offset, the
+# same whether FastAPI encodes the model or a route hands the dump to orjson.
+UTCDateTime = Annotated[
+    datetime,
+    AfterValidator(_as_utc),
+    PlainSerializer(lambda value: value.isoformat(), return_type=str, when_used="json"),
+]
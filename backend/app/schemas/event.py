@@ -2,10 +2,12 @@
 
 from datetime import datetime
 from typing import Optional
+from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 from app.db.models import EntryExit, VehicleType
+from app.schemas.common import UTCDateTime
 
 
 class EventBase(BaseModel):
@@ -13,8 +15,8 @@ class EventBase(BaseModel):
     camera_id: int
     entry_exit: EntryExit
     vehicle_type: Optional[VehicleType] = None
-    timestamp: datetime
-    event_uuid: str
+    timestamp: UTCDateTime
+    event_uuid: UUID
     plate_number: Optional[str] = None
     barcode_value: Optional[str] = None
     material_type: Optional[str] = None
@@ -24,7 +26,7 @@ class EventBase(BaseModel):
     snapshot_path: Optional[str] = None
     load_crop_path: Optional[str] = None
     edited_by: Optional[str] = None
-    edited_at: Optional[datetime] = None
+    edited_at: Optional[UTCDateTime] = None
     edit_reason: Optional[str] = None
 
 
@@ -32,10 +34,25 @@ class EventOut(EventBase):
     id: int
     track_id: Optional[int]
     confidence: Optional[float]
-    created_at: datetime
+    created_at: UTCDateTime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+# Built once and reused by list endpoints instead of per request
+EVENT_LIST_ADAPTER = TypeAdapter(list[EventOut])
+
+
+class EventCount(BaseModel):
+    name: str
+    count: int
+
+
+class EventSummary(BaseModel):
+    total: int
+    avg_load: float
+    vehicle_types: list[EventCount]
+    materials: list[EventCount]
 
 
 class EventCorrection(BaseModel):
@@ -59,3 +76,4 @@ class EventFilter(BaseModel):
     gate_id: Optional[int] = None
     vehicle_type: Optional[VehicleType] = None
     entry_exit: Optional[EntryExit] = None
+    load_label: Optional[str] = None
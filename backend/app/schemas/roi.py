@@ -1,9 +1,10 @@
 """Schemas for ROI definitions."""
 
-from datetime import datetime
 from typing import List, Tuple
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.schemas.common import UTCDateTime
 
 
 class ROICreate(BaseModel):
@@ -17,7 +18,6 @@ class ROICreate(BaseModel):
 
 class ROIOut(ROICreate):
     id: int
-    created_at: datetime
+    created_at: UTCDateTime
 
-    class Config:
-        orm_mode = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
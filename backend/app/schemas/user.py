@@ -1,10 +1,9 @@
 """Schemas related to users."""
 
-from datetime import datetime
-
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.db.models import Role
+from app.schemas.common import UTCDateTime
 
 
 class UserBase(BaseModel):
@@ -19,7 +18,6 @@ class UserCreate(UserBase):
 class UserOut(UserBase):
     id: int
     role: Role
-    created_at: datetime
+    created_at: UTCDateTime
 
-    class Config:
-        orm_mode = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
@@ -1,9 +1,10 @@
 """Schemas for video upload and listing."""
 
-from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+
+from app.schemas.common import UTCDateTime
 
 
 class VideoOut(BaseModel):
@@ -14,7 +15,10 @@ class VideoOut(BaseModel):
     size_bytes: int
     status: Optional[str] = None
     uploaded_by_id: Optional[int] = None
-    created_at: datetime
+    created_at: UTCDateTime
+
+    model_config = ConfigDict(from_attributes=True)
+
 
-    class Config:
-        orm_mode = True
+# Built once and reused by list endpoints instead of per request
+VIDEO_LIST_ADAPTER = TypeAdapter(list[VideoOut])
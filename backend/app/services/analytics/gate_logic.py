@@ -2,6 +2,12 @@
 
 from typing import Tuple, List
 
+import numpy as np
+
+# Direction codes returned by ``classify_tracks``
+ENTRY = 0
+EXIT = 1
+
 
 def point_inside_rect(x: float, y: float, rect: List[List[float]]) -> bool:
     """Return True if a point lies within the rectangle defined by two points.
@@ -14,8 +20,8 @@ def point_inside_rect(x: float, y: float, rect: List[List[float]]) -> bool:
         True if (x,y) lies within the rectangle.
     """
     (x1, y1), (x2, y2) = rect
-    left, right = sorted([x1, x2])
-    top, bottom = sorted([y1, y2])
+    left, right = (x1, x2) if x1 < x2 else (x2, x1)
+    top, bottom = (y1, y2) if y1 < y2 else (y2, y1)
     return left <= x <= right and top <= y <= bottom
 
 
@@ -32,3 +38,34 @@ def determine_entry_exit(prev_pos: Tuple[float, float], curr_pos: Tuple[float, f
         if prev_y >= mid_y > curr_y:
             return "ENTRY"
     return "ENTRY" if curr_y < prev_y else "EXIT"
+
+
+
+def classify_tracks(prevs, currs, rects) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorised ``point_inside_rect``/``determine_entry_exit`` over many tracks.
+
+    Args:
+        prevs: ``(N, 2)`` previous centroids.
+        currs: ``(N, 2)`` current centroids.
+        rects: ``(N, 2, 2)`` rectangles, or a single ``(2, 2)`` rectangle
+            shared by every track.
+    Returns:
+        Tuple of (inside, direction): a bool array telling whether each
+        current centroid lies in its rectangle, and an int8 array of
+        ``ENTRY``/``EXIT`` codes using the same rules as
+        ``determine_entry_exit``.
+    """
+    prevs = np.asarray(prevs, dtype=np.float64).reshape(-1, 2)
+    currs = np.asarray(currs, dtype=np.float64).reshape(-1, 2)
+    rects = np.broadcast_to(np.asarray(rects, dtype=np.float64), (len(currs), 2, 2))
+    lo = rects.min(axis=1)
+    hi = rects.max(axis=1)
+    inside = np.all((lo <= currs) & (currs <= hi), axis=1)
+
+    prev_y = prevs[:, 1]
+    curr_y = currs[:, 1]
+    mid_y = (rects[:, 0, 1] + rects[:, 1, 1]) / 2.0
+    direction = np.where(curr_y < prev_y, ENTRY, EXIT)
+    direction = np.where((prev_y >= mid_y) & (mid_y > curr_y), ENTRY, direction)
+    direction = np.where((prev_y <= mid_y) & (mid_y < curr_y), EXIT, direction)
+    return inside, direction.astype(np.int8)
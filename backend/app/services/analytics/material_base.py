@@ -1,6 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Tuple
+from typing import List, Sequence, Tuple
 import numpy as np
 import cv2
 
@@ -18,30 +18,46 @@ class MaterialLoadEstimatorBase:
         raise NotImplementedError
 
 
+# Bucket edges: values below the first edge map to the first label, and a
+# value equal to an edge falls into the bucket above it.
+_MAT_EDGES = np.array([20.0, 40.0, 60.0])
+_MATS = ("sand", "soil", "stone", "debris")
+_LOAD_EDGES = np.array([25.0, 50.0, 75.0])
+_LABELS = ("Empty", "Partial", "Half", "Full")
+
+
+def load_label(pct: float) -> str:
+    """Label (Empty/Partial/Half/Full) for a load percentage."""
+    return _LABELS[int(np.searchsorted(_LOAD_EDGES, pct, side="right"))]
+
+
 class DeterministicEstimator(MaterialLoadEstimatorBase):
     """Deterministic, testable baseline using image stats."""
 
+    @staticmethod
+    def _stats(crop) -> Tuple[float, float]:
+        gray = crop if crop.ndim == 2 else cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+        # Mean and (population) std in one pass
+        mean, std = cv2.meanStdDev(gray)
+        return float(mean[0, 0]), float(std[0, 0])
+
     def estimate(self, crop) -> MaterialLoadEstimate:
-        gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
-        mean_val = float(np.mean(gray))
-        std_val = float(np.std(gray))
-        # Material based on std bucket
-        if std_val < 20:
-            mat = "sand"
-        elif std_val < 40:
-            mat = "soil"
-        elif std_val < 60:
-            mat = "stone"
-        else:
-            mat = "debris"
-        conf = min(1.0, 0.5 + std_val / 100.0)
-        pct = float(np.clip(mean_val / 255.0 * 100.0, 0, 100))
-        if pct < 25:
-            lbl = "Empty"
-        elif pct < 50:
-            lbl = "Partial"
-        elif pct < 75:
-            lbl = "Half"
-        else:
-            lbl = "Full"
-        return MaterialLoadEstimate(material_type=mat, material_confidence=conf, load_percentage=pct, load_label=lbl)
+        return self.estimate_batch([crop])[0]
+
+    def estimate_batch(self, crops: Sequence[np.ndarray]) -> List[MaterialLoadEstimate]:
+        """Estimate several crops, classifying all of them in one lookup."""
+        stats = np.array([self._stats(c) for c in crops], dtype=np.float64).reshape(-1, 2)
+        means, stds = stats[:, 0], stats[:, 1]
+        mat_idx = np.searchsorted(_MAT_EDGES, stds, side="right")
+        confs = np.minimum(1.0, 0.5 + stds / 100.0)
+        pcts = np.clip(means / 255.0 * 100.0, 0, 100)
+        lbl_idx = np.searchsorted(_LOAD_EDGES, pcts, side="right")
+        return [
+            MaterialLoadEstimate(
+                material_type=_MATS[m],
+                material_confidence=float(c),
+                load_percentage=float(p),
+                load_label=_LABELS[lbl],
+            )
+            for m, c, p, lbl in zip(mat_idx.tolist(), confs, pcts, lbl_idx.tolist())
+        ]
@@ -7,19 +7,29 @@ Falls back to brightness-based heuristics when models are unavailable.
 from __future__ import annotations
 
 import os
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import List, Optional, Tuple
 
 import cv2
 import numpy as np
 
-try:
-    import onnxruntime as ort  # type: ignore
-except Exception:
-    ort = None  # Optional dependency
+from app.services.analytics.material_base import load_label
+from app.services.ort_session import load_session, ort
 
 
 MATERIAL_LABELS = ["sand", "soil", "stone", "debris"]
+_INPUT_SIZE = (224, 224)
+
+
+def _run_now(fn, *args) -> Future:
+    """Run ``fn`` in the calling thread, returning it as a completed future."""
+    future: Future = Future()
+    try:
+        future.set_result(fn(*args))
+    except Exception as exc:
+        future.set_exception(exc)
+    return future
 
 
 @dataclass
@@ -42,73 +52,115 @@ class MaterialModelEstimator:
         self.labels = labels or MATERIAL_LABELS
         self.material_session = None
         self.load_session = None
+        # ONNX Runtime releases the GIL in run(), so the material and load
+        # models execute concurrently over the frame's batch of crops; each
+        # session's intra-op pool is half the cores (see ort_session), so two
+        # runs fill the CPU without oversubscribing it
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="material-ort")
         if ort and material_model_path and os.path.exists(material_model_path):
             try:
-                self.material_session = ort.InferenceSession(material_model_path, providers=["CPUExecutionProvider"])
+                self.material_session = load_session(material_model_path)
                 # Heuristic: pick first input name
                 self.material_input = self.material_session.get_inputs()[0].name
             except Exception as exc:
                 print(f"Material model load failed ({material_model_path}): {exc}")
         if ort and load_model_path and os.path.exists(load_model_path):
             try:
-                self.load_session = ort.InferenceSession(load_model_path, providers=["CPUExecutionProvider"])
+                self.load_session = load_session(load_model_path)
                 self.load_input = self.load_session.get_inputs()[0].name
             except Exception as exc:
                 print(f"Load model load failed ({load_model_path}): {exc}")
 
-    def _preprocess(self, img: np.ndarray, size: Tuple[int, int] = (224, 224)) -> np.ndarray:
-        """Basic preprocess: BGR->RGB, resize, normalize to 0-1, NCHW float32."""
-        resized = cv2.resize(img, size)
-        rgb = cv2.cvtColor(resized, cv2.COLOR_BGR2RGB)
-        arr = rgb.astype(np.float32) / 255.0
-        chw = np.transpose(arr, (2, 0, 1))
-        return np.expand_dims(chw, 0)  # (1,C,H,W)
-
-    def _load_label(self, pct: float) -> str:
-        if pct < 25:
-            return "Empty"
-        if pct < 50:
-            return "Partial"
-        if pct < 75:
-            return "Half"
-        return "Full"
+    def _preprocess(self, img: np.ndarray, size: Tuple[int, int] = _INPUT_SIZE) -> np.ndarray:
+        """Basic preprocess: BGR->RGB, resize, normalize to 0-1, NCHW float32.
+
+        ``blobFromImage`` does all four steps in one native call.
+        """
+        return cv2.dnn.blobFromImage(img, 1 / 255.0, size, swapRB=True, crop=False)  # (1,C,H,W)
+
+    @staticmethod
+    def _batch_size(session) -> Optional[int]:
+        """Fixed batch size of a session's first input, or None if dynamic."""
+        dim = session.get_inputs()[0].shape[0] if session.get_inputs()[0].shape else None
+        return dim if isinstance(dim, int) and dim > 0 else None
+
+    def _run(self, session, input_name: str, batch: np.ndarray) -> np.ndarray:
+        """Run a session over a preprocessed batch; returns the first output, one row per crop."""
+        fixed = self._batch_size(session)
+        if fixed is None or fixed == len(batch):
+            out = session.run(None, {input_name: batch})[0]
+        else:
+            # Model exported with a static batch axis: feed it chunk by chunk
+            out = np.concatenate(
+                [session.run(None, {input_name: batch[i : i + fixed]})[0] for i in range(0, len(batch), fixed)]
+            )
+        return out.reshape(len(batch), -1)
 
     def estimate(self, crop: np.ndarray) -> MaterialLoadEstimate:
         """Run models if available; otherwise use heuristic brightness/std fallback."""
-        material_type = "unknown"
-        material_conf = 0.0
-        load_pct = 0.0
-        # Material classification
+        return self.estimate_batch([crop])[0]
+
+    def estimate_batch(self, crops: List[np.ndarray]) -> List[MaterialLoadEstimate]:
+        """Estimate several crops with one session call per model.
+
+        Each crop is preprocessed once and the same (N,3,224,224) tensor is
+        fed to both the material and the load model.
+        """
+        n = len(crops)
+        if n == 0:
+            return []
+        material_types = ["unknown"] * n
+        material_confs = [0.0] * n
+        load_pcts = [0.0] * n
+        batch = None
+        if self.material_session is not None or self.load_session is not None:
+            batch = cv2.dnn.blobFromImages(crops, 1 / 255.0, _INPUT_SIZE, swapRB=True, crop=False)
+        material_future = load_future = None
+        # The pool only pays off when both models run; a lone model runs inline
+        submit = self._pool.submit if self.material_session is not None and self.load_session is not None else _run_now
         if self.material_session is not None:
+            material_future = submit(self._run, self.material_session, self.material_input, batch)
+        if self.load_session is not None:
+            load_future = submit(self._run, self.load_session, self.load_input, batch)
+        # Material classification
+        if material_future is not None:
             try:
-                inp = self._preprocess(crop)
-                outputs = self.material_session.run(None, {self.material_input: inp})
-                logits = outputs[0].squeeze()
+                logits = material_future.result()
                 # softmax
-                exp = np.exp(logits - np.max(logits))
-                probs = exp / np.sum(exp)
-                idx = int(np.argmax(probs))
-                material_type = self.labels[idx] if idx < len(self.labels) else f"class_{idx}"
-                material_conf = float(probs[idx])
+                exp = np.exp(logits - np.max(logits, axis=1, keepdims=True))
+                probs = exp / np.sum(exp, axis=1, keepdims=True)
+                for i, row in enumerate(probs):
+                    idx = int(np.argmax(row))
+                    material_types[i] = self.labels[idx] if idx < len(self.labels) else f"class_{idx}"
+                    material_confs[i] = float(row[idx])
             except Exception as exc:
                 print(f"Material inference failed: {exc}")
         # Load estimation
-        if self.load_session is not None:
+        if load_future is not None:
             try:
-                inp = self._preprocess(crop)
-                outputs = self.load_session.run(None, {self.load_input: inp})
-                load_val = float(np.squeeze(outputs[0]))
-                # assume model outputs 0-1 or 0-100; clamp to 0-100
-                if load_val <= 1.0:
-                    load_pct = max(0.0, min(100.0, load_val * 100.0))
-                else:
-                    load_pct = max(0.0, min(100.0, load_val))
+                values = load_future.result()[:, 0]
+                for i, load_val in enumerate(values.tolist()):
+                    # assume model outputs 0-1 or 0-100; clamp to 0-100
+                    if load_val <= 1.0:
+                        load_pcts[i] = max(0.0, min(100.0, load_val * 100.0))
+                    else:
+                        load_pcts[i] = max(0.0, min(100.0, load_val))
             except Exception as exc:
                 print(f"Load inference failed: {exc}")
-        # Fallbacks
-        if material_conf == 0.0 or material_type == "unknown":
+        return [
+            self._finish(crop, material_types[i], material_confs[i], load_pcts[i])
+            for i, crop in enumerate(crops)
+        ]
+
+    def _finish(self, crop: np.ndarray, material_type: str, material_conf: float, load_pct: float) -> MaterialLoadEstimate:
+        """Apply the heuristic fallbacks where a model gave no answer."""
+        need_material = material_conf == 0.0 or material_type == "unknown"
+        if need_material or load_pct == 0.0:
+            # One grayscale conversion and one pass for both fallbacks
             gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
-            std_val = float(np.std(gray))
+            mean, std = cv2.meanStdDev(gray)
+            mean_val, std_val = float(mean[0, 0]), float(std[0, 0])
+        if need_material:
             if std_val < 20:
                 material_type = "sand"
             elif std_val < 40:
@@ -119,12 +171,10 @@ class MaterialModelEstimator:
                 material_type = "debris"
             material_conf = min(1.0, 0.5 + std_val / 100.0)
         if load_pct == 0.0:
-            gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
-            load_pct = float(np.clip(np.mean(gray) / 255.0 * 100.0, 0, 100))
-        load_label = self._load_label(load_pct)
+            load_pct = float(np.clip(mean_val / 255.0 * 100.0, 0, 100))
         return MaterialLoadEstimate(
             material_type=material_type,
             material_confidence=material_conf,
             load_percentage=load_pct,
-            load_label=load_label,
+            load_label=load_label(load_pct),
         )
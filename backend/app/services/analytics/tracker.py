@@ -1,81 +1,158 @@
 """Simple IOU-based tracker to keep persistent IDs across frames."""
 
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import List, Tuple, Dict
+from dataclasses import dataclass, field
+from typing import List, Optional
 import itertools
 
+import numpy as np
+from scipy.optimize import linear_sum_assignment
 
-def _iou(a: Tuple[int, int, int, int], b: Tuple[int, int, int, int]) -> float:
-    x1 = max(a[0], b[0]); y1 = max(a[1], b[1])
-    x2 = min(a[2], b[2]); y2 = min(a[3], b[3])
-    inter = max(0, x2 - x1) * max(0, y2 - y1)
-    if inter <= 0:
-        return 0.0
-    area_a = (a[2] - a[0]) * (a[3] - a[1])
-    area_b = (b[2] - b[0]) * (b[3] - b[1])
-    return inter / max(1e-6, area_a + area_b - inter)
+
+def _areas(boxes: np.ndarray) -> np.ndarray:
+    """Areas of (N,4) x1,y1,x2,y2 boxes -> (N,)."""
+    return (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+
+
+def _iou_matrix(
+    a: np.ndarray,
+    b: np.ndarray,
+    area_a: np.ndarray | None = None,
+    area_b: np.ndarray | None = None,
+) -> np.ndarray:
+    """Pairwise IoU between (N,4) and (M,4) x1,y1,x2,y2 boxes -> (N,M).
+
+    ``area_a``/``area_b`` may be passed when the box areas are already known.
+    """
+    tl = np.maximum(a[:, None, :2], b[None, :, :2])
+    br = np.minimum(a[:, None, 2:], b[None, :, 2:])
+    wh = np.clip(br - tl, 0, None)
+    inter = wh[..., 0] * wh[..., 1]
+    if area_a is None:
+        area_a = _areas(a)
+    if area_b is None:
+        area_b = _areas(b)
+    return inter / np.maximum(area_a[:, None] + area_b[None, :] - inter, 1e-6)
 
 
 @dataclass
 class TrackState:
     track_id: int
-    bbox: Tuple[int, int, int, int]
+    bbox: np.ndarray  # (4,) int32 x1,y1,x2,y2
     cls_name: str
     conf: float
     age: int = 0
+    area: int = field(init=False)
+
+    def __post_init__(self):
+        self.bbox = np.asarray(self.bbox, dtype=np.int32)
+        x1, y1, x2, y2 = self.bbox.tolist()
+        self.area = (x2 - x1) * (y2 - y1)
 
 
 class TrackManager:
-    def __init__(self, iou_threshold: float = 0.3, max_age: int = 30):
+    """IoU tracker over a fixed pool of track slots.
+
+    Tracks live in ``max_tracks`` preallocated slots with a free list, and
+    their boxes/areas in slot-indexed arrays, so a frame updates state in
+    place instead of rebuilding a dict and re-stacking every box.
+    """
+
+    def __init__(self, iou_threshold: float = 0.3, max_age: int = 30, max_tracks: int = 256):
         self.iou_threshold = iou_threshold
         self.max_age = max_age
+        self.max_tracks = max_tracks
         self._next_id = itertools.count(1)
-        self._tracks: Dict[int, TrackState] = {}
+        self._slots: List[Optional[TrackState]] = [None] * max_tracks
+        self._free: List[int] = list(range(max_tracks - 1, -1, -1))  # pop() -> lowest slot
+        self._live = np.zeros(max_tracks, dtype=bool)
+        self._bboxes = np.zeros((max_tracks, 4), dtype=np.int32)
+        self._areas = np.zeros(max_tracks, dtype=np.int64)
+        self._ids = np.zeros(max_tracks, dtype=np.int64)
 
     def update(self, detections: List[dict]) -> List[TrackState]:
         # detections: list of dict with bbox, cls_name, conf
         assigned = set()
-        new_tracks = {}
-
-        # match existing to detections
-        for tid, st in self._tracks.items():
-            best_iou = 0.0
-            best_idx = None
-            for j, det in enumerate(detections):
-                if j in assigned:
-                    continue
-                iou = _iou(st.bbox, det["bbox"])
-                if iou > best_iou:
-                    best_iou = iou
-                    best_idx = j
-            if best_idx is not None and best_iou >= self.iou_threshold:
+        live = self._live.nonzero()[0]
+
+        det_boxes = np.array([det["bbox"] for det in detections], dtype=np.int32).reshape(-1, 4)
+        det_areas = _areas(det_boxes).astype(np.int64)
+        if live.size and detections:
+            ious = _iou_matrix(self._bboxes[live], det_boxes, self._areas[live], det_areas)
+        else:
+            ious = np.zeros((live.size, len(detections)))
+
+        # match existing to detections: optimal one-to-one assignment that
+        # maximises total IoU over pairs above the threshold (others count 0)
+        matches = {}
+        if ious.size:
+            ious[ious < self.iou_threshold] = 0.0
+            if min(ious.shape) == 1:
+                # One track or one detection (the common gate case): the
+                # optimal assignment is simply the best pair
+                row, col = np.unravel_index(int(ious.argmax()), ious.shape)
+                rows, cols = np.array([row]), np.array([col])
+            else:
+                rows, cols = linear_sum_assignment(ious, maximize=True)
+            for row, col in zip(rows.tolist(), cols.tolist()):
+                iou = float(ious[row, col])
+                if iou > 0.0 and iou >= self.iou_threshold:
+                    matches[row] = col
+
+        # (slot, detection index) pairs whose box arrays are written in one go
+        put_slots: List[int] = []
+        put_dets: List[int] = []
+        for row, slot in enumerate(live.tolist()):
+            st = self._slots[slot]
+            best_idx = matches.get(row)
+            if best_idx is not None:
                 det = detections[best_idx]
                 assigned.add(best_idx)
-                new_tracks[tid] = TrackState(
-                    track_id=tid,
-                    bbox=det["bbox"],
+                self._slots[slot] = TrackState(
+                    track_id=st.track_id,
+                    bbox=det_boxes[best_idx],
                     cls_name=det["cls_name"],
                     conf=det["conf"],
                     age=0,
                 )
+                put_slots.append(slot)
+                put_dets.append(best_idx)
             else:
                 st.age += 1
-                if st.age <= self.max_age:
-                    new_tracks[tid] = st
+                if st.age > self.max_age:
+                    self._slots[slot] = None
+                    self._live[slot] = False
+                    self._free.append(slot)
 
         # new detections -> new tracks
         for j, det in enumerate(detections):
             if j in assigned:
                 continue
-            tid = next(self._next_id)
-            new_tracks[tid] = TrackState(
-                track_id=tid,
-                bbox=det["bbox"],
+            if not self._free:
+                break  # every slot is in use; drop until tracks expire
+            slot = self._free.pop()
+            self._slots[slot] = TrackState(
+                track_id=next(self._next_id),
+                bbox=det_boxes[j],
                 cls_name=det["cls_name"],
                 conf=det["conf"],
                 age=0,
             )
+            self._live[slot] = True
+            self._ids[slot] = self._slots[slot].track_id
+            put_slots.append(slot)
+            put_dets.append(j)
+
+        if put_slots:
+            self._bboxes[put_slots] = det_boxes[put_dets]
+            self._areas[put_slots] = det_areas[put_dets]
+        return [self._slots[slot] for slot in self._live.nonzero()[0].tolist()]
+
+    def live_arrays(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(slots, track_ids, bboxes) of the live tracks, in ``update()`` order.
 
-        self._tracks = new_tracks
-        return list(self._tracks.values())
+        Slots are stable for a track's lifetime and lie in ``range(max_tracks)``,
+        so callers can keep per-track state in arrays indexed by slot.
+        """
+        live = self._live.nonzero()[0]
+        return live, self._ids[live], self._bboxes[live]
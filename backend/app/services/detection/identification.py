@@ -1,12 +1,14 @@
 """Identification helpers for ANPR and barcode decoding.
 
-This attempts lightweight OCR via pytesseract and barcode decode via pyzbar.
+Plates are read by an in-process ONNX ``PlateRecognizer`` when one is
+passed in, otherwise via pytesseract; barcodes are decoded via pyzbar.
 If native dependencies (tesseract binary, zbar) are missing, it will fallback
 to returning None values.
 """
 
 from __future__ import annotations
-from typing import Optional, Tuple
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
 import cv2
 import numpy as np
 
@@ -25,15 +27,81 @@ try:
 except Exception:
     PlateDetector = None  # type: ignore
 
+try:
+    from app.services.detection.plate_recognizer import PlateRecognizer
+except Exception:
+    PlateRecognizer = None  # type: ignore
+
+# Wide closing kernel that merges plate characters into one blob
+_MORPH_KERNEL = np.ones((3, 15), np.uint8)
+# Minimum windowed mean |Sobel-x| (0-255 scale) for a crop to be handed to
+# pyzbar: a dense run of bar edges, not the odd panel line. Lower it if
+# labels are missed, raise it if pyzbar still runs on most plain crops.
+_BARCODE_EDGE_THRESHOLD = 40
+
 
 def _clean_text(txt: str) -> str:
     txt = txt.strip()
     txt = txt.replace("\n", " ")
     return " ".join(txt.split())
 
+
+def _bbox_iou(a: Tuple[int, int, int, int], b: Tuple[int, int, int, int]) -> float:
+    iw = max(0, min(a[2], b[2]) - max(a[0], b[0]))
+    ih = max(0, min(a[3], b[3]) - max(a[1], b[1]))
+    inter = iw * ih
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+@dataclass
+class _OCREntry:
+    plate: Optional[str]
+    barcode: Optional[str]
+    bbox: Tuple[int, int, int, int]
+    frame_idx: int
+
+
+class OCRCache:
+    """Per-track cache of plate/barcode reads.
+
+    A read is reused while the track's box still overlaps the box it was
+    read from (IoU above ``iou_threshold``) and it is at most
+    ``max_age_frames`` old, so a dwelling vehicle is OCR'd once per window
+    instead of on every event.
+    """
+
+    def __init__(self, iou_threshold: float = 0.7, max_age_frames: int = 150):
+        self.iou_threshold = iou_threshold
+        self.max_age_frames = max_age_frames
+        self._entries: Dict[int, _OCREntry] = {}
+
+    def get(self, track_id: int, bbox, frame_idx: int) -> Optional[Tuple[Optional[str], Optional[str]]]:
+        entry = self._entries.get(track_id)
+        if entry is None or frame_idx - entry.frame_idx > self.max_age_frames:
+            return None
+        if _bbox_iou(entry.bbox, bbox) <= self.iou_threshold:
+            return None
+        return entry.plate, entry.barcode
+
+    def put(self, track_id: int, bbox, frame_idx: int, plate: Optional[str], barcode: Optional[str]) -> None:
+        # Only successful reads are worth reusing; failures retry next time
+        if plate is None and barcode is None:
+            return
+        self._entries[track_id] = _OCREntry(plate, barcode, tuple(bbox), frame_idx)
+        # Drop entries of tracks that have since expired
+        stale = [k for k, e in self._entries.items() if frame_idx - e.frame_idx > self.max_age_frames]
+        for k in stale:
+            del self._entries[k]
+
+
 def _find_plate_region(crop: np.ndarray) -> np.ndarray:
-    """Heuristic plate region finder: looks for high-contrast, wide rectangles."""
-    gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+    """Heuristic plate region finder: looks for high-contrast, wide rectangles.
+
+    The filter chain runs on a ``cv2.UMat`` so OpenCV can dispatch it to
+    OpenCL where available (plain CPU otherwise).
+    """
+    gray = cv2.cvtColor(cv2.UMat(crop), cv2.COLOR_BGR2GRAY)
     gray = cv2.bilateralFilter(gray, 9, 75, 75)
     # Edge emphasis
     grad_x = cv2.Sobel(gray, cv2.CV_32F, 1, 0, ksize=3)
@@ -41,9 +109,9 @@ def _find_plate_region(crop: np.ndarray) -> np.ndarray:
     mag = cv2.magnitude(grad_x, grad_y)
     mag = cv2.convertScaleAbs(mag)
     _, th = cv2.threshold(mag, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-    th = cv2.morphologyEx(th, cv2.MORPH_CLOSE, np.ones((3, 15), np.uint8), iterations=2)
+    th = cv2.morphologyEx(th, cv2.MORPH_CLOSE, _MORPH_KERNEL, iterations=2)
     contours, _ = cv2.findContours(th, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-    h, w = gray.shape[:2]
+    h, w = crop.shape[:2]
     best = None
     best_score = 0
     for cnt in contours:
@@ -63,10 +131,12 @@ def _find_plate_region(crop: np.ndarray) -> np.ndarray:
     return crop
 
 
-def _ocr_plate(crop: np.ndarray) -> Optional[str]:
+def _ocr_plate(crop: np.ndarray, already_cropped: bool = False) -> Optional[str]:
+    """Tesseract read of one plate; the fallback when no recognizer is loaded."""
     if pytesseract is None:
         return None
-    plate_region = _find_plate_region(crop)
+    # A plate detector crop is already tight; only search raw vehicle crops
+    plate_region = crop if already_cropped else _find_plate_region(crop)
     gray = cv2.cvtColor(plate_region, cv2.COLOR_BGR2GRAY)
     gray = cv2.bilateralFilter(gray, 9, 75, 75)
     _, th = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
@@ -75,33 +145,91 @@ def _ocr_plate(crop: np.ndarray) -> Optional[str]:
     return txt if txt else None
 
 
+def batch_ocr(regions: Sequence[Tuple[np.ndarray, bool]], recognizer: "PlateRecognizer") -> List[Optional[str]]:
+    """Read several plates with one recognizer forward pass.
+
+    ``regions`` holds ``(crop, already_cropped)`` pairs; raw vehicle crops
+    are narrowed to their plate region first.
+    """
+    return recognizer.recognize_batch([c if already_cropped else _find_plate_region(c) for c, already_cropped in regions])
+
+
+def _has_barcode_texture(crop: np.ndarray) -> bool:
+    """Cheap check for a patch dense in vertical edges (the bars of a 1D barcode).
+
+    Sobel-x responds to intensity changes along x, i.e. vertical edges.
+    """
+    gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY) if crop.ndim == 3 else crop
+    edges = cv2.convertScaleAbs(cv2.Sobel(gray, cv2.CV_16S, 1, 0, ksize=3))
+    h, w = edges.shape[:2]
+    # Mean edge strength over windows about an eighth of the crop wide
+    density = cv2.blur(edges, (max(1, w // 8), max(1, h // 8)))
+    return float(density.max()) >= _BARCODE_EDGE_THRESHOLD
+
+
 def _decode_barcode(crop: np.ndarray) -> Optional[str]:
     if pyzbar is None:
         return None
+    # Most vehicle crops carry no barcode; skip the full pyzbar scan for them
+    if not _has_barcode_texture(crop):
+        return None
     barcodes = pyzbar.decode(crop)
     if not barcodes:
         return None
     return barcodes[0].data.decode("utf-8")
 
 
-def identify_from_crop(crop: np.ndarray, mode: str, plate_detector: Optional["PlateDetector"] = None, plate_conf: float = 0.35) -> Tuple[Optional[str], Optional[str]]:
-    """Return (plate, barcode) based on mode."""
-    plate = None
-    barcode = None
+def _plate_region(
+    crop: np.ndarray, plate_detector: Optional["PlateDetector"], plate_conf: float
+) -> Tuple[np.ndarray, bool]:
+    """Return (region, already_cropped): the best detected plate, else the whole crop."""
+    if plate_detector is not None:
+        try:
+            dets = plate_detector.detect(crop)
+            if dets:
+                best = max(dets, key=lambda d: d.conf)
+                if best.conf >= plate_conf:
+                    x1, y1, x2, y2 = best.bbox
+                    region = crop[max(0, y1):max(y1, y2), max(0, x1):max(x1, x2)]
+                    if region.size:
+                        return region, True
+        except Exception:
+            pass
+    return crop, False
+
+
+def identify_batch(
+    crops: Sequence[np.ndarray],
+    mode: str,
+    plate_detector: Optional["PlateDetector"] = None,
+    plate_conf: float = 0.35,
+    plate_recognizer: Optional["PlateRecognizer"] = None,
+) -> List[Tuple[Optional[str], Optional[str]]]:
+    """Return (plate, barcode) for each crop based on mode.
+
+    With a ``plate_recognizer`` every plate region is read in one forward
+    pass; the tesseract fallback still reads them one at a time.
+    """
+    plates: List[Optional[str]] = [None] * len(crops)
+    barcodes: List[Optional[str]] = [None] * len(crops)
     mode_upper = mode.upper()
-    if mode_upper in ("ANPR", "BOTH"):
-        plate_region = crop
-        if plate_detector is not None:
-            try:
-                dets = plate_detector.detect(crop)
-                if dets:
-                    best = max(dets, key=lambda d: d.conf)
-                    if best.conf >= plate_conf:
-                        x1, y1, x2, y2 = best.bbox
-                        plate_region = crop[max(0, y1):max(y1, y2), max(0, x1):max(x1, x2)]
-            except Exception:
-                pass
-        plate = _ocr_plate(plate_region)
+    if mode_upper in ("ANPR", "BOTH") and crops:
+        regions = [_plate_region(crop, plate_detector, plate_conf) for crop in crops]
+        if plate_recognizer is not None:
+            plates = batch_ocr(regions, plate_recognizer)
+        else:
+            plates = [_ocr_plate(region, cropped) for region, cropped in regions]
     if mode_upper in ("BARCODE", "BOTH"):
-        barcode = _decode_barcode(crop)
-    return plate, barcode
+        barcodes = [_decode_barcode(crop) for crop in crops]
+    return list(zip(plates, barcodes))
+
+
+def identify_from_crop(
+    crop: np.ndarray,
+    mode: str,
+    plate_detector: Optional["PlateDetector"] = None,
+    plate_conf: float = 0.35,
+    plate_recognizer: Optional["PlateRecognizer"] = None,
+) -> Tuple[Optional[str], Optional[str]]:
+    """Return (plate, barcode) based on mode."""
+    return identify_batch([crop], mode, plate_detector, plate_conf, plate_recognizer)[0]
@@ -0,0 +1,62 @@
+"""In-process ONNX text recognizer for licence plates.
+
+Runs a CRNN-style recognizer (e.g. a PaddleOCR rec or PARSeq export with
+CTC head) on batches of plate crops, replacing the per-plate tesseract
+subprocess. Expected input (N, 3, 32, 128) and output (N, T, 1 + len(charset))
+logits with the CTC blank at index 0; a (T, N, C) output is also accepted.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import cv2
+import numpy as np
+
+from app.services.ort_session import create_session
+
+PLATE_CHARSET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+class PlateRecognizer:
+    def __init__(self, model_path: str, charset: str = PLATE_CHARSET, size: tuple[int, int] = (128, 32)):
+        self.model_path = Path(model_path)
+        if not self.model_path.exists():
+            raise FileNotFoundError(f"Plate OCR model not found at {self.model_path}")
+        self.session = create_session(str(self.model_path))
+        self.input_name = self.session.get_inputs()[0].name
+        self.charset = charset
+        self.size = size
+
+    def _preprocess(self, crops: Sequence[np.ndarray]) -> np.ndarray:
+        """Resize each crop into one (N,3,H,W) batch normalised to [-1, 1]."""
+        w, h = self.size
+        batch = np.empty((len(crops), h, w, 3), dtype=np.uint8)
+        for i, crop in enumerate(crops):
+            cv2.resize(crop, self.size, dst=batch[i])
+        batch = batch[..., ::-1].transpose(0, 3, 1, 2).astype(np.float32)
+        return batch * (2 / 255.0) - 1.0
+
+    def _decode(self, logits: np.ndarray) -> List[Optional[str]]:
+        """Greedy CTC decode: argmax, collapse repeats, drop blanks."""
+        ids = logits.argmax(2)  # (N, T)
+        keep = ids != 0
+        keep[:, 1:] &= ids[:, 1:] != ids[:, :-1]
+        out: List[Optional[str]] = []
+        for row, mask in zip(ids, keep):
+            text = "".join(self.charset[i - 1] for i in row[mask] if i <= len(self.charset))
+            out.append(text or None)
+        return out
+
+    def recognize_batch(self, crops: Sequence[np.ndarray]) -> List[Optional[str]]:
+        """Read all ``crops`` in a single forward pass."""
+        if not crops:
+            return []
+        logits = self.session.run(None, {self.input_name: self._preprocess(crops)})[0]
+        if logits.shape[0] != len(crops) and logits.shape[1] == len(crops):
+            logits = logits.transpose(1, 0, 2)
+        return self._decode(logits)
+
+    def recognize(self, crop: np.ndarray) -> Optional[str]:
+        return self.recognize_batch([crop])[0]
@@ -16,6 +16,9 @@ import numpy as np
 
 from app.db.models import VehicleType
 
+# Taller frames are thresholded at this height and boxes scaled back up
+_MAX_HEIGHT = 720
+
 
 def detect_vehicles(frame: np.ndarray) -> List[Tuple[int, int, int, int, VehicleType, float]]:
     """Detect vehicles in a frame.
@@ -27,13 +30,19 @@ def detect_vehicles(frame: np.ndarray) -> List[Tuple[int, int, int, int, Vehicle
         The coordinates define the bounding box. For the stub always
         returns one detection for the green rectangle if present.
     """
-    hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-    # Threshold for green color of our sample rectangle
-    mask = cv2.inRange(hsv, (40, 50, 50), (80, 255, 255))
+    scale = 1.0
+    if frame.shape[0] > _MAX_HEIGHT:
+        scale = frame.shape[0] / _MAX_HEIGHT
+        frame = cv2.resize(frame, None, fx=1 / scale, fy=1 / scale, interpolation=cv2.INTER_AREA)
+    # Green dominance straight on the BGR bytes (one pass, no HSV frame);
+    # cv2.subtract saturates at 0 so uint8 differences cannot wrap
+    b, g, r = cv2.split(frame)
+    mask = (cv2.subtract(g, r) > 30) & (cv2.subtract(g, b) > 30) & (g >= 50)
+    mask = mask.view(np.uint8)
     contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
     detections = []
     for cnt in contours:
-        x, y, w, h = cv2.boundingRect(cnt)
+        x, y, w, h = (round(v * scale) for v in cv2.boundingRect(cnt))
         if w * h < 500:  # ignore small blobs
             continue
         detections.append((x, y, w, h, VehicleType.truck, 0.9))
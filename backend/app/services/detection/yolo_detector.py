@@ -1,6 +1,7 @@
 """YOLO ONNX detector for vehicles with simple class remapping.
 
-This uses OpenCV DNN with a YOLOv8 ONNX export. Expected output shape:
+This runs a YOLOv8 ONNX export through ONNX Runtime (OpenCV DNN if
+onnxruntime is not installed). Expected output shape:
  (batch, num_dets, 4 + num_classes) with xywh format. If the model is
  structured differently, adapt parsing accordingly.
 """
@@ -8,10 +9,13 @@ This uses OpenCV DNN with a YOLOv8 ONNX export. Expected output shape:
 from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Tuple
+from typing import List, Sequence, Tuple
 import cv2
 import numpy as np
 
+from app.services.detection.nms import nms
+from app.services.ort_session import ImageModelRunner, ort
+
 # COCO class indices for vehicles
 COCO_CLASS_MAP = {
     2: "Car/4-wheeler",   # car
@@ -20,6 +24,7 @@ COCO_CLASS_MAP = {
     7: "Truck",           # truck
     1: "Bike/2-wheeler",  # bicycle
 }
+_VEHICLE_CLASS_IDS = np.fromiter(COCO_CLASS_MAP, dtype=np.int64)
 
 
 @dataclass
@@ -34,44 +39,58 @@ class YOLODetector:
         self.model_path = Path(model_path)
         if not self.model_path.exists():
             raise FileNotFoundError(f"YOLO model not found at {self.model_path}")
-        self.net = cv2.dnn.readNetFromONNX(str(self.model_path))
+        # ONNX Runtime when installed, OpenCV DNN otherwise
+        self.runner = ImageModelRunner(str(self.model_path), (640, 640)) if ort else None
+        self.net = None if self.runner else cv2.dnn.readNetFromONNX(str(self.model_path))
         self.conf_threshold = conf_threshold
         self.iou_threshold = iou_threshold
 
     def detect(self, frame) -> List[Detection]:
         h, w = frame.shape[:2]
-        blob = cv2.dnn.blobFromImage(frame, 1/255.0, (640, 640), swapRB=True, crop=False)
-        self.net.setInput(blob)
-        preds = self.net.forward()
+        if self.runner is not None:
+            preds = self.runner.run(frame)
+        else:
+            blob = cv2.dnn.blobFromImage(frame, 1/255.0, (640, 640), swapRB=True, crop=False)
+            self.net.setInput(blob)
+            preds = self.net.forward()
         if isinstance(preds, list):
             preds = preds[0]
+        return self._decode(preds, w, h)
+
+    def detect_batch(self, frames: Sequence[np.ndarray]) -> List[List[Detection]]:
+        """Detect on several frames (e.g. one per camera) in one forward pass."""
+        if self.runner is None or len(frames) == 1:
+            return [self.detect(frame) for frame in frames]
+        preds = self.runner.run_batch(frames)
+        return [self._decode(p, f.shape[1], f.shape[0]) for p, f in zip(preds, frames)]
+
+    def _decode(self, preds: np.ndarray, w: int, h: int) -> List[Detection]:
+        """Turn one frame's raw output into NMS-filtered detections in frame pixels."""
         preds = np.squeeze(preds)  # (num, 4+cls)
 
-        bboxes = []
-        scores = []
-        class_ids = []
-        for det in preds:
-            if det.shape[0] < 6:
-                continue
-            cx, cy, bw, bh = det[:4]
-            cls_scores = det[4:]
-            cls_id = int(np.argmax(cls_scores))
-            score = float(cls_scores[cls_id])
-            if score < self.conf_threshold or cls_id not in COCO_CLASS_MAP:
-                continue
-            x1 = int((cx - bw / 2) * w / 640)
-            y1 = int((cy - bh / 2) * h / 640)
-            x2 = int((cx + bw / 2) * w / 640)
-            y2 = int((cy + bh / 2) * h / 640)
-            bboxes.append([x1, y1, x2, y2])
-            scores.append(score)
-            class_ids.append(cls_id)
+        if preds.ndim != 2 or preds.shape[1] < 6:
+            return []
+
+        # Decode all anchors at once instead of looping in Python
+        cls_scores = preds[:, 4:]
+        cls_ids = cls_scores.argmax(1)
+        scores = cls_scores[np.arange(len(preds)), cls_ids]
+        keep = (scores >= self.conf_threshold) & np.isin(cls_ids, _VEHICLE_CLASS_IDS)
+        preds, scores, class_ids = preds[keep], scores[keep], cls_ids[keep]
+        cx, cy, bw, bh = preds[:, :4].T
+        bboxes = np.stack(
+            (
+                (cx - bw / 2) * w / 640,
+                (cy - bh / 2) * h / 640,
+                (cx + bw / 2) * w / 640,
+                (cy + bh / 2) * h / 640,
+            ),
+            axis=1,
+        ).astype(np.int32)
 
-        idxs = cv2.dnn.NMSBoxes(bboxes, scores, self.conf_threshold, self.iou_threshold)
         detections: List[Detection] = []
-        if len(idxs) > 0:
-            for i in idxs.flatten():
-                cls_name = COCO_CLASS_MAP.get(class_ids[i], "Unknown")
-                x1, y1, x2, y2 = bboxes[i]
-                detections.append(Detection(bbox=(x1, y1, x2, y2), cls_name=cls_name, conf=float(scores[i])))
+        for i in nms(bboxes, scores, self.iou_threshold):
+            cls_name = COCO_CLASS_MAP.get(int(class_ids[i]), "Unknown")
+            x1, y1, x2, y2 = bboxes[i].tolist()
+            detections.append(Detection(bbox=(x1, y1, x2, y2), cls_name=cls_name, conf=float(scores[i])))
         return detections
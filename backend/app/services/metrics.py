@@ -1,20 +1,40 @@
-"""In-memory metrics counters for local use."""
+"""In-process metrics counters for local use.
 
-from collections import defaultdict
-from typing import Dict, Tuple
+Backed by ``prometheus_client`` counters, whose increments are atomic and
+whose per-label children are cached, so hot paths in the worker threads
+neither race nor rebuild dict keys.
+"""
 
-events_total = defaultdict(int)  # key: (gate, vehicle_type, direction)
-notifications_sent_total = defaultdict(int)  # key: (channel, status)
-stream_errors_total = defaultdict(int)  # key: camera_id
+from typing import Dict, Iterator, Tuple
+
+from prometheus_client import CollectorRegistry, Counter
+
+REGISTRY = CollectorRegistry()
+
+events_total = Counter(
+    "vehicle_events", "Vehicle events", ["gate", "vehicle_type", "direction"], registry=REGISTRY
+)
+notifications_sent_total = Counter(
+    "notifications_sent", "Notifications sent", ["channel", "status"], registry=REGISTRY
+)
+stream_errors_total = Counter("stream_errors", "Stream errors", ["camera"], registry=REGISTRY)
+
+
+def samples(counter: Counter) -> Iterator[Tuple[Dict[str, str], float]]:
+    """Yield ``(labels, value)`` for each labelled child of ``counter``."""
+    for metric in counter.collect():
+        for sample in metric.samples:
+            if sample.name.endswith("_total"):
+                yield sample.labels, sample.value
 
 
 def inc_event(gate: int, vehicle_type: str, direction: str):
-    events_total[(gate, vehicle_type, direction)] += 1
+    events_total.labels(gate, vehicle_type, direction).inc()
 
 
 def inc_notification(channel: str, status: str):
-    notifications_sent_total[(channel, status)] += 1
+    notifications_sent_total.labels(channel, status).inc()
 
 
 def inc_stream_error(camera_id: int):
-    stream_errors_total[camera_id] += 1
+    stream_errors_total.labels(camera_id).inc()
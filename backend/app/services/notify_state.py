@@ -0,0 +1,73 @@
+"""Event and notification state shared through Redis by the API and every worker.
+
+Workers cache notification rules per process; the API bumps a rules
+version on every rule change so those caches are dropped everywhere, not
+only in the process that served the request. Per-track event debounce and
+per (gate, channel) notification debounce also live in Redis, as expiring
+keys, so that worker processes agree on them and they survive restarts.
+"""
+
+import threading
+import time
+from functools import lru_cache
+
+import redis
+from cachetools import TTLCache
+
+from app.core.config import get_settings
+
+
+_RULES_VERSION_KEY = "notify:rules_version"
+
+# Per-process fallback used while Redis is unreachable
+_local_claims: TTLCache = TTLCache(maxsize=4096, ttl=3600)
+_local_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _redis_client() -> redis.Redis:
+    return redis.Redis.from_url(get_settings().redis_url)
+
+
+def rules_version() -> int:
+    """Current notification rules version (0 if unset or Redis is down)."""
+    try:
+        return int(_redis_client().get(_RULES_VERSION_KEY) or 0)
+    except redis.RedisError:
+        return 0
+
+
+def bump_rules_version() -> None:
+    """Mark cached notification rules as stale in every process."""
+    try:
+        _redis_client().incr(_RULES_VERSION_KEY)
+    except redis.RedisError as exc:
+        print(f"Could not bump notification rules version: {exc}")
+
+
+def _claim(key: str, seconds: float) -> bool:
+    """Claim ``key`` for ``seconds``; False while an earlier claim is live."""
+    try:
+        return bool(_redis_client().set(key, 1, nx=True, px=int(seconds * 1000)))
+    except redis.RedisError:
+        now = time.time()
+        with _local_lock:
+            if now - _local_claims.get(key, 0) < seconds:
+                return False
+            _local_claims[key] = now
+            return True
+
+
+def try_acquire_debounce(gate_id: int, channel: str, seconds: int) -> bool:
+    """Return True if ``channel`` may notify for ``gate_id`` now, claiming the slot.
+
+    The claim expires after ``seconds``; later callers get False until then.
+    """
+    if seconds <= 0:
+        return True
+    return _claim(f"notify:debounce:{gate_id}:{channel}", seconds)
+
+
+def try_acquire_event(camera_id: int, track_id: int, seconds: float) -> bool:
+    """Return True if a track may emit an event now (per-track debounce)."""
+    return _claim(f"event:debounce:{camera_id}:{track_id}", seconds)
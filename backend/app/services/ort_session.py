@@ -0,0 +1,142 @@
+"""Shared ONNX Runtime session construction.
+
+All ONNX models in the worker are opened through ``create_session`` so they
+get the same graph optimisation level, thread pools and execution provider
+list (``settings.ONNX_PROVIDERS``, filtered to what the installed
+onnxruntime build offers).
+"""
+
+from __future__ import annotations
+
+import os
+from typing import List, Sequence, Tuple, Union
+
+import cv2
+import numpy as np
+
+try:
+    import onnxruntime as ort  # type: ignore
+except Exception:
+    ort = None  # Optional dependency
+
+from app.core.config import get_settings
+
+
+def session_options():
+    """SessionOptions with full graph fusion and a fixed intra-op thread pool."""
+    so = ort.SessionOptions()
+    so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    so.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    # Leave half the cores for video decode and the rest of the worker
+    so.intra_op_num_threads = max(1, (os.cpu_count() or 2) // 2)
+    so.inter_op_num_threads = 1
+    return so
+
+
+def providers() -> List[Union[str, Tuple[str, dict]]]:
+    """Configured execution providers that this onnxruntime build supports.
+
+    OpenVINO gets its target device from ``settings.OPENVINO_DEVICE_TYPE``
+    and its compiled-model cache from ``settings.OPENVINO_CACHE_DIR``;
+    CPU is always appended as the last resort.
+    """
+    settings = get_settings()
+    available = set(ort.get_available_providers())
+    chosen: List[Union[str, Tuple[str, dict]]] = []
+    for name in settings.ONNX_PROVIDERS:
+        if name not in available or name == "CPUExecutionProvider":
+            continue
+        if name == "OpenVINOExecutionProvider":
+            options = {"device_type": settings.OPENVINO_DEVICE_TYPE}
+            if settings.OPENVINO_CACHE_DIR:
+                # Compiled blobs are reused on the next start instead of recompiling
+                options["cache_dir"] = settings.OPENVINO_CACHE_DIR
+            chosen.append((name, options))
+        else:
+            chosen.append(name)
+    return chosen + ["CPUExecutionProvider"]
+
+
+def create_session(model_path: str):
+    """Open an InferenceSession with the shared options and providers.
+
+    If an accelerator provider fails to initialise (e.g. the configured
+    OpenVINO device is absent), the model is reopened on CPU only.
+    """
+    chosen = providers()
+    try:
+        return ort.InferenceSession(model_path, session_options(), providers=chosen)
+    except Exception as exc:
+        if chosen == ["CPUExecutionProvider"]:
+            raise
+        print(f"ONNX providers {chosen} failed for {model_path}, using CPU: {exc}")
+        return ort.InferenceSession(model_path, session_options(), providers=["CPUExecutionProvider"])
+
+
+def int8_model_path(model_path: str) -> str:
+    """Path of the INT8 variant written by ``scripts/quantize_models.py``/``quantize_detectors.py``."""
+    root, ext = os.path.splitext(model_path)
+    return f"{root}.int8{ext or '.onnx'}"
+
+
+def load_session(model_path: str):
+    """Open the INT8 variant of a model if present, else the FP32 file."""
+    int8_path = int8_model_path(model_path)
+    if os.path.exists(int8_path):
+        try:
+            return create_session(int8_path)
+        except Exception as exc:
+            print(f"INT8 model load failed ({int8_path}), using FP32: {exc}")
+    return create_session(model_path)
+
+
+class ImageModelRunner:
+    """Run a single-input NCHW image model on BGR frames.
+
+    The resize/colour-convert/normalise steps write into buffers allocated
+    once, and the input tensor is bound to the session through IOBinding
+    over that same memory, so no per-frame blob is allocated or copied.
+    The result matches ``cv2.dnn.blobFromImage(frame, 1/255, size,
+    swapRB=True, crop=False)``. An INT8 variant of the model is preferred
+    when one exists (see ``load_session``).
+    """
+
+    def __init__(self, model_path: str, size: Tuple[int, int] = (640, 640)):
+        self.session = load_session(model_path)
+        self.size = size
+        w, h = size
+        self._resized = np.empty((h, w, 3), dtype=np.uint8)
+        self._rgb = np.empty((h, w, 3), dtype=np.uint8)
+        self._blob = np.empty((1, 3, h, w), dtype=np.float32)
+        self._input = ort.OrtValue.ortvalue_from_numpy(self._blob)  # shares self._blob's memory
+        self._input_name = self.session.get_inputs()[0].name
+        self._binding = self.session.io_binding()
+        self._binding.bind_ortvalue_input(self._input_name, self._input)
+        self._binding.bind_output(self.session.get_outputs()[0].name, "cpu")
+
+    def run(self, frame: np.ndarray) -> np.ndarray:
+        """Preprocess ``frame`` into the bound buffer and return the first output."""
+        cv2.resize(frame, self.size, dst=self._resized)
+        cv2.cvtColor(self._resized, cv2.COLOR_BGR2RGB, dst=self._rgb)
+        np.multiply(self._rgb.transpose(2, 0, 1), 1 / 255.0, out=self._blob[0], casting="unsafe")
+        self.session.run_with_iobinding(self._binding)
+        return self._binding.copy_outputs_to_cpu()[0]
+
+    def run_batch(self, frames: Sequence[np.ndarray]) -> np.ndarray:
+        """Run several frames through the model; returns the first output, one row per frame.
+
+        Models with a dynamic batch axis take all frames in one call; a
+        fixed batch size is filled chunk by chunk (zero-padding the last).
+        """
+        blob = cv2.dnn.blobFromImages(frames, 1 / 255.0, self.size, swapRB=True, crop=False)
+        dim = self.session.get_inputs()[0].shape[0]
+        fixed = dim if isinstance(dim, int) and dim > 0 else None
+        if fixed is None or fixed == len(frames):
+            return self.session.run(None, {self._input_name: blob})[0]
+        outs = []
+        for i in range(0, len(blob), fixed):
+            chunk = blob[i : i + fixed]
+            if len(chunk) < fixed:
+                chunk = np.concatenate([chunk, np.zeros((fixed - len(chunk), *chunk.shape[1:]), chunk.dtype)])
+            outs.append(self.session.run(None, {self._input_name: chunk})[0])
+        return np.concatenate(outs)[: len(frames)]
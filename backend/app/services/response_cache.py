@@ -0,0 +1,61 @@
+"""Short-lived in-process cache for read-mostly API responses.
+
+Entries are keyed as ``"<resource>:<detail>"`` so that write endpoints can
+drop every cached view of a resource with a single :func:`invalidate`
+call. Values should be plain data (dicts/lists), never ORM instances,
+because they outlive the session that loaded them.
+
+Each resource has a version counter in Redis that :func:`invalidate` bumps
+and every lookup reads, so a write in one API process also retires the
+entries cached by every other process (like ``notify_state`` does for
+notification rules). While Redis is unreachable the cache is bypassed.
+"""
+
+import threading
+from functools import lru_cache
+from typing import Any, Callable
+
+import redis
+from cachetools import TTLCache
+
+from app.core.config import get_settings
+
+
+_cache: TTLCache = TTLCache(maxsize=512, ttl=60)
+_lock = threading.Lock()
+_MISSING = object()
+_VERSION_KEY = "response_cache:version:{}"
+
+
+@lru_cache(maxsize=1)
+def _redis_client() -> redis.Redis:
+    return redis.Redis.from_url(get_settings().redis_url)
+
+
+def get_or_set(key: str, loader: Callable[[], Any]) -> Any:
+    """Return the cached value for ``key`` or compute and store it."""
+    resource = key.split(":", 1)[0]
+    try:
+        version = int(_redis_client().get(_VERSION_KEY.format(resource)) or 0)
+    except redis.RedisError:
+        return loader()
+    with _lock:
+        value = _cache.get((key, version), _MISSING)
+    if value is not _MISSING:
+        return value
+    value = loader()
+    with _lock:
+        _cache[(key, version)] = value
+    return value
+
+
+def invalidate(resource: str) -> None:
+    """Drop all cached entries for a resource (e.g. ``"cameras"``) in every process."""
+    try:
+        _redis_client().incr(_VERSION_KEY.format(resource))
+    except redis.RedisError as exc:
+        print(f"Could not bump {resource} cache version: {exc}")
+    prefix = f"{resource}:"
+    with _lock:
+        for cache_key in [k for k in _cache.keys() if k[0].startswith(prefix)]:
+            _cache.pop(cache_key, None)
@@ -6,15 +6,31 @@ application settings. If the bucket does not exist, it will be
 created automatically on first use.
 """
 
+import io
 import os
+from functools import lru_cache
 from typing import Optional
 
+import certifi
+import urllib3
 from minio import Minio
 from minio.error import S3Error
 
 from app.core.config import get_settings
 
 
+def _http_client(secure: bool) -> urllib3.PoolManager:
+    """Connection pool sized for concurrent uploads from one process."""
+    tls = {"cert_reqs": "CERT_REQUIRED", "ca_certs": os.environ.get("SSL_CERT_FILE") or certifi.where()}
+    return urllib3.PoolManager(
+        num_pools=4,
+        maxsize=32,
+        timeout=urllib3.Timeout(connect=5, read=30),
+        retries=urllib3.Retry(total=3, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504]),
+        **(tls if secure else {}),
+    )
+
+
 class MinioService:
     """Service for uploading files to MinIO."""
 
@@ -31,6 +47,7 @@ class MinioService:
             access_key=access_key,
             secret_key=secret_key,
             secure=self._secure,
+            http_client=_http_client(self._secure),
         )
         self.bucket = bucket
         # Ensure bucket exists
@@ -54,6 +71,15 @@ class MinioService:
         self.client.fput_object(self.bucket, object_name, file_path)
         return object_name
 
+    def upload_bytes(self, data: bytes, object_name: str, content_type: str = "image/jpeg") -> str:
+        """Upload in-memory ``data`` to MinIO under ``object_name``.
+
+        Returns:
+            The object name stored in the bucket.
+        """
+        self.client.put_object(self.bucket, object_name, io.BytesIO(data), len(data), content_type=content_type)
+        return object_name
+
     def public_url(self, object_name: str) -> str:
         """Return a fetchable URL for the given object."""
         scheme = "https" if self._secure else "http"
@@ -64,3 +90,9 @@ class MinioService:
         else:
             base = f"{scheme}://{endpoint}"
         return f"{base}/{self.bucket}/{object_name.lstrip('/')}"
+
+
+@lru_cache(maxsize=1)
+def get_minio() -> MinioService:
+    """Process-wide MinioService, so its connection pool is shared by all callers."""
+    return MinioService()
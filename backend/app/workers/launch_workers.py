@@ -1,11 +1,14 @@
 """Launch stream processing tasks for all active cameras.
 
 This helper enumerates active cameras in the database and dispatches
-Celery tasks to process their streams. It can be invoked as part of
-the worker container's startup command.
+Celery tasks to process their streams, grouping up to
+``DETECT_BATCH_SIZE`` cameras per task so their frames share one
+detector forward pass. It can be invoked as part of the worker
+container's startup command.
 """
 
 from app.core.celery_app import celery_app
+from app.core.config import get_settings
 from app.db.session import SessionLocal
 from app.db import models
 
@@ -14,8 +17,10 @@ def launch_all() -> None:
     db = SessionLocal()
     try:
         cameras = db.query(models.Camera).filter(models.Camera.is_active == True).all()
-        for camera in cameras:
-            celery_app.send_task("app.workers.tasks.process_camera_stream", args=[camera.id])
+        batch_size = max(1, get_settings().DETECT_BATCH_SIZE)
+        camera_ids = [camera.id for camera in cameras]
+        for i in range(0, len(camera_ids), batch_size):
+            celery_app.send_task("app.workers.tasks.process_camera_streams", args=[camera_ids[i : i + batch_size]])
         print(f"Dispatched stream processing tasks for {len(cameras)} cameras")
     finally:
         db.close()
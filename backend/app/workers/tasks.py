@@ -1,15 +1,22 @@
 """Celery tasks for stream processing and notifications."""
 
+import base64
 import os
+import threading
 import time
-import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
-from pathlib import Path
+from functools import lru_cache
 
 import cv2
+import numpy as np
+from cachetools import TTLCache
 from celery import shared_task
 from sqlalchemy.orm import Session
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from app.core.config import get_settings
 from app.core.celery_app import celery_app
@@ -18,33 +25,491 @@ from app.db.session import SessionLocal
 from app.services.detection.stub_detector import detect_vehicles
 from app.services.detection.yolo_detector import YOLODetector
 from app.services.detection.plate_detector import PlateDetector
-from app.services.detection.identification import identify_from_crop
+from app.services.detection.plate_recognizer import PlateRecognizer
+from app.services.detection.identification import OCRCache, identify_batch
 from app.services.analytics.tracker import TrackManager
-from app.services.analytics.gate_logic import point_inside_rect, determine_entry_exit
+from app.services.analytics.gate_logic import EXIT, classify_tracks
 from app.services.analytics.material_base import DeterministicEstimator
 from app.services.analytics.material_model import MaterialModelEstimator
-from app.services.storage.minio_client import MinioService
+from app.services.storage.minio_client import get_minio
 from app.services import metrics as m
+from app.services import notify_state
 from app.db.models import NotificationRule, NotificationChannel
 
 
 settings = get_settings()
 
-# Prevent spamming events: {(camera_id, track_id): last_event_timestamp}
-_last_event_time: dict[tuple[int, int], float] = {}
-# Debounce notifications per (gate, channel)
-_last_notify_time: dict[tuple[int, str], float] = {}
 
+_JPEG_PARAMS = [int(cv2.IMWRITE_JPEG_QUALITY), 85]
+
+# Detector class name (lower-cased) -> VehicleType
+_VEHICLE_TYPES = {
+    "truck": models.VehicleType.truck,
+    "dumper": models.VehicleType.dumper,
+    "car/4-wheeler": models.VehicleType.car,
+    "car": models.VehicleType.car,
+    "bike/2-wheeler": models.VehicleType.bike,
+    "bike": models.VehicleType.bike,
+    "tractor": models.VehicleType.tractor,
+    "trolley": models.VehicleType.tractor,
+}
+
+
+def _identify_vehicles(
+    frame,
+    bboxes,
+    mode: str,
+    plate_detector=None,
+    plate_conf: float = 0.35,
+    plate_recognizer=None,
+    ocr_cache: OCRCache | None = None,
+    track_ids=None,
+    frame_idx: int = 0,
+):
+    """Identify plate/barcode for several vehicle boxes in one frame; graceful fallback.
+
+    With ``ocr_cache`` and ``track_ids``, a recent read for the same track
+    and roughly the same box is reused; the remaining crops are identified
+    together, so the plate recognizer runs one forward pass per frame.
+    """
+    use_cache = ocr_cache is not None and track_ids is not None
+    results = [(None, None)] * len(bboxes)
+    pending, crops = [], []
+    for i, bbox in enumerate(bboxes):
+        if use_cache:
+            cached = ocr_cache.get(track_ids[i], bbox, frame_idx)
+            if cached is not None:
+                results[i] = cached
+                continue
+        x1, y1, x2, y2 = map(int, bbox)
+        x1 = max(0, x1); y1 = max(0, y1)
+        crop = frame[y1:max(y1, y2), x1:max(x1, x2)]
+        if crop.size == 0:
+            continue
+        pending.append(i)
+        crops.append(crop)
+    if crops:
+        reads = identify_batch(
+            crops, mode, plate_detector=plate_detector, plate_conf=plate_conf, plate_recognizer=plate_recognizer
+        )
+        for i, (plate, barcode) in zip(pending, reads):
+            results[i] = (plate, barcode)
+            if use_cache:
+                ocr_cache.put(track_ids[i], bboxes[i], frame_idx, plate, barcode)
+    return results
+
+
+@dataclass
+class _Pipeline:
+    """Models shared by every stream a worker task processes."""
+
+    detector: YOLODetector | None
+    plate_detector: PlateDetector | None
+    plate_recognizer: PlateRecognizer | None
+    mat_estimator: MaterialModelEstimator | DeterministicEstimator
+
+
+def _load_pipeline() -> _Pipeline:
+    """Load the detectors and estimators, falling back where a model is missing."""
+    detector = None
+    plate_detector = None
+    plate_recognizer = None
+    mat_estimator = None
+    try:
+        detector = YOLODetector(settings.YOLO_MODEL_PATH, conf_threshold=0.35, iou_threshold=0.45)
+        print(f"[worker] Using YOLO model at {settings.YOLO_MODEL_PATH}")
+    except Exception as exc:
+        print(f"[worker] YOLO detector unavailable, using stub detector: {exc}")
+    if str(settings.IDENT_MODE).upper() in ("ANPR", "BOTH"):
+        try:
+            plate_detector = PlateDetector(settings.PLATE_MODEL_PATH, conf_threshold=settings.PLATE_CONF, iou_threshold=0.45)
+            print(f"[worker] Using plate model at {settings.PLATE_MODEL_PATH}")
+        except Exception as exc:
+            print(f"[worker] Plate detector unavailable, using heuristic: {exc}")
+        if settings.PLATE_OCR_MODEL_PATH:
+            try:
+                plate_recognizer = PlateRecognizer(settings.PLATE_OCR_MODEL_PATH, charset=settings.PLATE_OCR_CHARSET)
+                print(f"[worker] Using plate OCR model at {settings.PLATE_OCR_MODEL_PATH}")
+            except Exception as exc:
+                print(f"[worker] Plate OCR model unavailable, using tesseract: {exc}")
+    # Material/load model if provided, else deterministic fallback
+    if getattr(settings, "MATERIAL_MODEL_PATH", None) or getattr(settings, "LOAD_MODEL_PATH", None):
+        mat_estimator = MaterialModelEstimator(
+            material_model_path=getattr(settings, "MATERIAL_MODEL_PATH", None),
+            load_model_path=getattr(settings, "LOAD_MODEL_PATH", None),
+        )
+        print(f"[worker] Using material/load models: {getattr(settings, 'MATERIAL_MODEL_PATH', None)}, {getattr(settings, 'LOAD_MODEL_PATH', None)}")
+    else:
+        mat_estimator = DeterministicEstimator()
+
+    return _Pipeline(detector, plate_detector, plate_recognizer, mat_estimator)
+
+
+class _CudaCapture:
+    """Minimal ``cv2.VideoCapture`` stand-in decoding on the GPU (NVDEC).
+
+    Decode runs in ``cv2.cudacodec``; only frames due for detection are
+    converted to BGR on the device and downloaded, skipped ones are just
+    grabbed. Rewinding reopens the reader since it cannot seek.
+    """
+
+    def __init__(self, video_path: str):
+        self._path = video_path
+        self._reader = cv2.cudacodec.createVideoReader(video_path)
+        # Container metadata only; read once through the CPU demuxer
+        probe = cv2.VideoCapture(video_path)
+        self._fps = probe.get(cv2.CAP_PROP_FPS)
+        probe.release()
+
+    def read(self):
+        ok, gpu_frame = self._reader.nextFrame()
+        if not ok:
+            return False, None
+        if gpu_frame.channels() == 4:
+            gpu_frame = cv2.cuda.cvtColor(gpu_frame, cv2.COLOR_BGRA2BGR)
+        return True, gpu_frame.download()
+
+    def grab(self) -> bool:
+        return self._reader.grab()
+
+    def get(self, prop_id: int) -> float:
+        return self._fps if prop_id == cv2.CAP_PROP_FPS else 0.0
+
+    def set(self, prop_id: int, value: float) -> bool:
+        if prop_id != cv2.CAP_PROP_POS_FRAMES or value != 0:
+            return False
+        self._reader = cv2.cudacodec.createVideoReader(self._path)
+        return True
+
+
+def _open_capture(video_path: str):
+    """Open ``video_path`` with the GPU decoder when DETECTION_BACKEND=cuda."""
+    if settings.DETECTION_BACKEND.lower() == "cuda":
+        try:
+            return _CudaCapture(video_path)
+        except Exception as exc:  # no CUDA build of OpenCV, or no GPU
+            print(f"[worker] CUDA video decode unavailable, using CPU: {exc}")
+    return cv2.VideoCapture(video_path)
+
+
+def _detection_window(roi_coordinates, frame_shape) -> tuple[int, int, int, int] | None:
+    """Padded ROI box (x1, y1, x2, y2) to run detection on, or None for the full frame.
+
+    The ROI is grown by 20% per side so tracks are picked up before they
+    reach it; when that still covers most of the frame, cropping is skipped.
+    """
+    h, w = frame_shape[:2]
+    (ax, ay), (bx, by) = roi_coordinates
+    rx1, rx2 = sorted((ax, bx))
+    ry1, ry2 = sorted((ay, by))
+    pad_x, pad_y = 0.2 * (rx2 - rx1), 0.2 * (ry2 - ry1)
+    x1, y1 = max(0, int(rx1 - pad_x)), max(0, int(ry1 - pad_y))
+    x2, y2 = min(w, int(rx2 + pad_x) + 1), min(h, int(ry2 + pad_y) + 1)
+    if x2 <= x1 or y2 <= y1 or (x2 - x1) * (y2 - y1) > 0.8 * w * h:
+        return None
+    return x1, y1, x2, y2
+
+
+class _CameraStream:
+    """Capture, tracking and crossing state for one camera."""
+
+    def __init__(self, camera: models.Camera, roi: models.ROI, video_path: str):
+        self.camera = camera
+        self.roi = roi
+        self.cap = _open_capture(video_path)
+        self.tracker = TrackManager(iou_threshold=0.35, max_age=20)
+        self.ocr_cache = OCRCache(max_age_frames=settings.OCR_CACHE_FRAMES)
+        # Crossing state per tracker slot; state_ids tells a slot's new track from its old one
+        self.state_ids = np.zeros(self.tracker.max_tracks, dtype=np.int64)
+        self.last_pos = np.full((self.tracker.max_tracks, 2), np.nan)
+        self.inside = np.zeros(self.tracker.max_tracks, dtype=bool)
+        self.frame_count = 0
+        self.backoff = 0.2
+        # Real-time spacing of source frames (30 fps when the source does not say)
+        fps = self.cap.get(cv2.CAP_PROP_FPS)
+        self.frame_interval = 1.0 / fps if 0 < fps <= 240 else 1.0 / 30
+        self._window: tuple[int, int, int, int] | None = None
+        self._window_shape = None
+
+    def detection_view(self, frame):
+        """``frame`` cropped to the padded ROI, and the crop's (x, y) offset."""
+        if frame.shape != self._window_shape:
+            self._window = _detection_window(self.roi.coordinates, frame.shape)
+            self._window_shape = frame.shape
+        if self._window is None:
+            return frame, (0, 0)
+        x1, y1, x2, y2 = self._window
+        return frame[y1:y2, x1:x2], (x1, y1)
+
+    def next_frame(self):
+        """Advance one frame; return it if it is due for detection, else None.
+
+        Only every (DETECT_FRAME_SKIP + 1)-th frame is decoded and run
+        through detection; the tracker carries vehicles across the gap.
+        """
+        detect_now = self.frame_count % (settings.DETECT_FRAME_SKIP + 1) == 0
+        if detect_now:
+            ret, frame = self.cap.read()
+        else:
+            ret, frame = self.cap.grab(), None
+        if not ret:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            time.sleep(self.backoff)
+            self.backoff = min(1.0, self.backoff + 0.1)
+            return None
+        self.backoff = 0.2
+        self.frame_count += 1
+        return frame
+
+
+def _stub_detections(frame) -> list[dict]:
+    dets = []
+    for x, y, w, h, vehicle_type, conf in detect_vehicles(frame):
+        dets.append({
+            "bbox": (x, y, x + w, y + h),
+            "cls_name": vehicle_type.value if hasattr(vehicle_type, "value") else str(vehicle_type),
+            "conf": conf,
+        })
+    return dets
+
+
+def _detect(pipeline: _Pipeline, views: list) -> list[list[dict]]:
+    """Detections for each (image, (dx, dy)) view, as tracker input dicts.
+
+    Boxes are shifted by the view's offset back into full-frame coordinates.
+    """
+    images = [image for image, _ in views]
+    if pipeline.detector:
+        batch = [
+            [{"bbox": d.bbox, "cls_name": d.cls_name, "conf": d.conf} for d in frame_dets]
+            for frame_dets in pipeline.detector.detect_batch(images)
+        ]
+    else:
+        batch = [_stub_detections(image) for image in images]
+    for (_, (dx, dy)), dets in zip(views, batch):
+        if dx or dy:
+            for det in dets:
+                x1, y1, x2, y2 = det["bbox"]
+                det["bbox"] = (x1 + dx, y1 + dy, x2 + dx, y2 + dy)
+    return batch
+
+
+def _snapshot_jpeg(frame, box) -> bytes:
+    """JPEG of ``frame`` with ``box`` outlined, without copying the frame.
+
+    The rectangle is drawn in place and only the pixels it covers are saved
+    and restored afterwards, since the same frame is still cropped for
+    identification and load estimation.
+    """
+    h, w = frame.shape[:2]
+    x1, y1, x2, y2 = (int(v) for v in box)
+    ya, yb, xa, xb = max(y1 - 2, 0), min(y2 + 3, h), max(x1 - 2, 0), min(x2 + 3, w)
+    edges = [
+        np.s_[ya : min(y1 + 3, h), xa:xb],
+        np.s_[max(y2 - 2, 0) : yb, xa:xb],
+        np.s_[ya:yb, xa : min(x1 + 3, w)],
+        np.s_[ya:yb, max(x2 - 2, 0) : xb],
+    ]
+    saved = [frame[edge].copy() for edge in edges]
+    cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
+    try:
+        ok, jpg = cv2.imencode(".jpg", frame, _JPEG_PARAMS)
+    finally:
+        for edge, pixels in zip(edges, saved):
+            frame[edge] = pixels
+    if not ok:
+        raise ValueError("JPEG encode failed")
+    return jpg.tobytes()
 
-def _identify_vehicle(frame, bbox, mode: str, plate_detector=None, plate_conf: float = 0.35):
-    """Identify plate/barcode from vehicle crop using OCR/decoder; graceful fallback."""
-    x1, y1, x2, y2 = map(int, bbox)
-    x1 = max(0, x1); y1 = max(0, y1)
-    crop = frame[y1:max(y1, y2), x1:max(x1, x2)]
-    if crop.size == 0:
-        return None, None
-    plate, barcode = identify_from_crop(crop, mode, plate_detector=plate_detector, plate_conf=plate_conf)
-    return plate, barcode
+
+def _handle_detections(stream: _CameraStream, pipeline: _Pipeline, frame, dets: list[dict]) -> None:
+    """Track ``dets`` on one camera and record an event for each ROI crossing.
+
+    Centroids, ROI membership and midline crossings are computed for all
+    live tracks at once on the tracker's slot arrays; identification and
+    material/load estimation run once over the crops of every track that
+    triggers an event.
+    """
+    camera, roi = stream.camera, stream.roi
+    tracks = stream.tracker.update(dets)
+    if not tracks:
+        return
+    slots, track_ids, boxes = stream.tracker.live_arrays()
+    (_, ry1), (_, ry2) = roi.coordinates
+    mid_y = (ry1 + ry2) * 0.5
+
+    # Slot state left over from an expired track does not carry to a new one
+    fresh = stream.state_ids[slots] != track_ids
+    stream.state_ids[slots] = track_ids
+    prev = stream.last_pos[slots]
+    prev[fresh] = np.nan
+    was_inside = stream.inside[slots] & ~fresh
+
+    cx = (boxes[:, 0] + boxes[:, 2]) * 0.5
+    cy = (boxes[:, 1] + boxes[:, 3]) * 0.5
+    # ROI membership and entry/exit direction for every track in one pass
+    # (direction is only used where has_prev; NaN rows compare False)
+    now_inside, directions = classify_tracks(prev, np.column_stack((cx, cy)), roi.coordinates)
+    stream.last_pos[slots, 0] = cx
+    stream.last_pos[slots, 1] = cy
+    stream.inside[slots] = now_inside
+
+    # Trigger when the centroid crosses the ROI midline (more stable than simple enter):
+    # it moved off the line to the other side of it, or off it having started on it
+    has_prev = ~np.isnan(prev[:, 1])
+    with np.errstate(invalid="ignore"):
+        mid_cross = has_prev & ((prev[:, 1] - mid_y) * (cy - mid_y) <= 0.0) & (cy != mid_y)
+    emit = mid_cross | (~was_inside & now_inside)
+
+    # Tracks that pass the debounce; identification and material/load
+    # estimation then run once over all of them
+    emitting = []
+    for i in np.flatnonzero(emit).tolist():
+        t = tracks[i]
+        direction = models.EntryExit.entry
+        if has_prev[i] and directions[i] == EXIT:
+            direction = models.EntryExit.exit
+
+        x1, y1, x2, y2 = t.bbox
+        crop_for_load = frame[max(0, int(y1)):max(int(y1), int(y2)), max(0, int(x1)):max(int(x1), int(x2))]
+        # A degenerate box would fail the whole batch below
+        if crop_for_load.size == 0:
+            continue
+
+        # Debounce per track
+        if not notify_state.try_acquire_event(camera.id, t.track_id, 2):
+            continue
+
+        # Snapshot image (with rectangle overlay); uploaded by emit_events
+        snapshot_jpg = _snapshot_jpeg(frame, (x1, y1, x2, y2))
+        emitting.append((t, direction, snapshot_jpg, crop_for_load))
+    if not emitting:
+        return
+
+    # Plate/barcode reads and material/load estimation for every emitting
+    # track, each in one batched run
+    identities = _identify_vehicles(
+        frame,
+        [t.bbox for t, *_ in emitting],
+        settings.IDENT_MODE,
+        pipeline.plate_detector,
+        settings.PLATE_CONF,
+        plate_recognizer=pipeline.plate_recognizer,
+        ocr_cache=stream.ocr_cache,
+        track_ids=[t.track_id for t, *_ in emitting],
+        frame_idx=stream.frame_count,
+    )
+    estimates = pipeline.mat_estimator.estimate_batch([crop for *_, crop in emitting])
+
+    payloads: list[dict] = []
+    for (t, direction, snapshot_jpg, crop_for_load), (plate, barcode), est in zip(emitting, identities, estimates):
+        vehicle_enum = _VEHICLE_TYPES.get(t.cls_name.lower())
+
+        load_jpg = None
+        ok, jpg = cv2.imencode(".jpg", crop_for_load, _JPEG_PARAMS)
+        if ok:
+            load_jpg = jpg.tobytes()
+        else:
+            print("load crop encode failed")
+
+        payloads.append(
+            {
+                "camera_id": camera.id,
+                "gate_id": camera.gate_id,
+                "track_id": t.track_id,
+                "direction": direction.value,
+                "vehicle_type": vehicle_enum.value if vehicle_enum else None,
+                "conf": float(t.conf),
+                "timestamp": datetime.utcnow().isoformat(),
+                "plate": plate,
+                "barcode": barcode,
+                "material_type": est.material_type,
+                "material_confidence": float(est.material_confidence),
+                "load_percentage": float(est.load_percentage),
+                "load_label": est.load_label,
+                "snapshot_jpg_b64": base64.b64encode(snapshot_jpg).decode("ascii"),
+                "load_jpg_b64": base64.b64encode(load_jpg).decode("ascii") if load_jpg else None,
+            }
+        )
+
+    # Uploads, the DB insert and the notifications run in emit_events, one
+    # task per frame, so MinIO/Postgres latency never stalls frame capture
+    if payloads:
+        emit_events.delay(payloads)
+
+
+def _run_streams(camera_ids: list[int]) -> None:
+    """Process several camera streams in one loop.
+
+    Frames due for detection on all cameras are gathered each iteration
+    and sent through the YOLO model as one batch (see DETECT_BATCH_SIZE
+    and launch_workers), instead of one forward pass per camera.
+    """
+    if settings.DETECTION_BACKEND.lower() == "jetson":
+        print("DETECTION_BACKEND=jetson stub active; implement DeepStream adapter.")
+        return
+    # Build absolute path to sample video file; we assume mediamtx and backend
+    # both mount /sample_media inside container
+    video_path = os.getenv("SAMPLE_VIDEO_PATH", "/sample_media/sample.mp4")
+    streams: list[_CameraStream] = []
+    # Short-lived session: the loop below never touches the DB (events are
+    # written by emit_events), so no connection is held idle in a transaction.
+    # Loaded Camera/ROI attributes stay readable after the session closes.
+    with SessionLocal() as db:
+        for camera_id in camera_ids:
+            camera = db.query(models.Camera).filter(models.Camera.id == camera_id).first()
+            if not camera:
+                continue
+            # Fetch ROI for the camera
+            roi = (
+                db.query(models.ROI)
+                .filter(models.ROI.gate_id == camera.gate_id, models.ROI.camera_id == camera.id)
+                .first()
+            )
+            if not roi:
+                continue
+            if not os.path.exists(video_path):
+                m.inc_stream_error(camera_id)
+                print(f"Sample video {video_path} not found")
+                continue
+            streams.append(_CameraStream(camera, roi, video_path))
+    if not streams:
+        return
+    pipeline = _load_pipeline()
+
+    # Detection of this iteration's frames runs on a helper thread (ONNX
+    # Runtime releases the GIL) while the previous iteration's results
+    # go through tracking, OCR and the hand-off to emit_events here
+    pending = None
+    # Each iteration consumes one frame per camera; pace to the fastest source
+    # rather than a fixed sleep, and do not sleep at all when behind
+    target_dt = min(stream.frame_interval for stream in streams)
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="detect") as detect_pool:
+        while True:
+            t0 = time.monotonic()
+            due = [(stream, frame) for stream in streams if (frame := stream.next_frame()) is not None]
+            submitted = None
+            if due:
+                # Only the area around each ROI is detected on
+                views = [stream.detection_view(frame) for stream, frame in due]
+                future = detect_pool.submit(_detect, pipeline, views)
+                submitted = (due, future)
+            if pending is not None:
+                prev_due, prev_future = pending
+                for (stream, frame), dets in zip(prev_due, prev_future.result()):
+                    _handle_detections(stream, pipeline, frame, dets)
+            pending = submitted
+            time.sleep(max(0.0, target_dt - (time.monotonic() - t0)))
+
+
+@celery_app.task(name="app.workers.tasks.process_camera_streams", bind=True)
+def process_camera_streams(self, camera_ids: list[int]) -> None:
+    """Consume a group of camera streams, batching detection across them.
+
+    Args:
+        camera_ids: Identifiers of the cameras to process together.
+    """
+    _run_streams(camera_ids)
 
 
 @celery_app.task(name="app.workers.tasks.process_camera_stream", bind=True)
@@ -59,191 +524,129 @@ def process_camera_stream(self, camera_id: int) -> None:
     Args:
         camera_id: Identifier of the camera to process.
     """
-    db: Session = SessionLocal()
-    try:
-        if settings.DETECTION_BACKEND.lower() == "jetson":
-            print("DETECTION_BACKEND=jetson stub active; implement DeepStream adapter.")
-            return
-        camera = db.query(models.Camera).filter(models.Camera.id == camera_id).first()
-        if not camera:
-            return
-        # Fetch ROI for the camera
-        roi = (
-            db.query(models.ROI)
-            .filter(models.ROI.gate_id == camera.gate_id, models.ROI.camera_id == camera.id)
-            .first()
-        )
-        if not roi:
-            return
-        # Build absolute path to sample video file; we assume mediamtx and backend
-        # both mount /sample_media inside container
-        video_path = os.getenv("SAMPLE_VIDEO_PATH", "/sample_media/sample.mp4")
-        if not os.path.exists(video_path):
-            m.inc_stream_error(camera_id)
-            print(f"Sample video {video_path} not found")
-            return
-        detector = None
-        plate_detector = None
-        mat_estimator = None
-        try:
-            detector = YOLODetector(settings.YOLO_MODEL_PATH, conf_threshold=0.35, iou_threshold=0.45)
-            print(f"[worker] Using YOLO model at {settings.YOLO_MODEL_PATH}")
-        except Exception as exc:
-            print(f"[worker] YOLO detector unavailable, using stub detector: {exc}")
-        if str(settings.IDENT_MODE).upper() in ("ANPR", "BOTH"):
+    _run_streams([camera_id])
+
+
+def _upload_jpeg(data_b64: str, object_name: str) -> str:
+    minio_service = get_minio()
+    return minio_service.public_url(minio_service.upload_bytes(base64.b64decode(data_b64), object_name))
+
+
+@celery_app.task(name="app.workers.tasks.emit_events")
+def emit_events(payloads: list[dict]) -> None:
+    """Upload the images of one frame's events, store them and queue notifications.
+
+    Each payload is built by the stream loop: event fields plus the snapshot
+    and optional load crop as base64 JPEG bytes. All events of the frame
+    are inserted with a single commit.
+    """
+    events = []
+    for payload in payloads:
+        # Unique without uuid4: a track emits at most once per 2 s debounce window
+        timestamp = datetime.fromisoformat(payload["timestamp"])
+        stem = f"{payload['camera_id']}_{payload['track_id']}_{int(timestamp.timestamp() * 1000)}"
+        snapshot_url = _upload_jpeg(payload["snapshot_jpg_b64"], f"{stem}.jpg")
+        load_crop_path = None
+        if payload.get("load_jpg_b64"):
             try:
-                plate_detector = PlateDetector(settings.PLATE_MODEL_PATH, conf_threshold=settings.PLATE_CONF, iou_threshold=0.45)
-                print(f"[worker] Using plate model at {settings.PLATE_MODEL_PATH}")
+                load_crop_path = _upload_jpeg(payload["load_jpg_b64"], f"load_{stem}.jpg")
             except Exception as exc:
-                print(f"[worker] Plate detector unavailable, using heuristic: {exc}")
-        # Material/load model if provided, else deterministic fallback
-        if getattr(settings, "MATERIAL_MODEL_PATH", None) or getattr(settings, "LOAD_MODEL_PATH", None):
-            mat_estimator = MaterialModelEstimator(
-                material_model_path=getattr(settings, "MATERIAL_MODEL_PATH", None),
-                load_model_path=getattr(settings, "LOAD_MODEL_PATH", None),
+                print(f"load crop save failed: {exc}")
+        vehicle_type = payload.get("vehicle_type")
+        events.append(
+            models.Event(
+                gate_id=payload["gate_id"],
+                camera_id=payload["camera_id"],
+                entry_exit=models.EntryExit(payload["direction"]),
+                vehicle_type=models.VehicleType(vehicle_type) if vehicle_type else None,
+                track_id=payload["track_id"],
+                confidence=payload["conf"],
+                timestamp=timestamp,
+                snapshot_path=snapshot_url,
+                plate_number=payload.get("plate"),
+                barcode_value=payload.get("barcode"),
+                material_type=payload.get("material_type"),
+                material_confidence=payload.get("material_confidence"),
+                load_percentage=payload.get("load_percentage"),
+                load_label=payload.get("load_label"),
+                load_crop_path=load_crop_path,
             )
-            print(f"[worker] Using material/load models: {getattr(settings, 'MATERIAL_MODEL_PATH', None)}, {getattr(settings, 'LOAD_MODEL_PATH', None)}")
-        else:
-            mat_estimator = DeterministicEstimator()
-
-        tracker = TrackManager(iou_threshold=0.35, max_age=20)
-        inside_state: dict[int, bool] = {}
-        last_pos: dict[int, tuple[float, float]] = {}
+        )
 
-        cap = cv2.VideoCapture(video_path)
-        frame_count = 0
-        backoff = 0.2
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-                time.sleep(backoff)
-                backoff = min(1.0, backoff + 0.1)
-                continue
-            backoff = 0.2
-            frame_count += 1
-            # Detect
-            dets = []
-            if detector:
-                for d in detector.detect(frame):
-                    dets.append({"bbox": d.bbox, "cls_name": d.cls_name, "conf": d.conf})
-            else:
-                for x, y, w, h, vehicle_type, conf in detect_vehicles(frame):
-                    dets.append({
-                        "bbox": (x, y, x + w, y + h),
-                        "cls_name": vehicle_type.value if hasattr(vehicle_type, "value") else str(vehicle_type),
-                        "conf": conf,
-                    })
-
-            tracks = tracker.update(dets)
-
-            for t in tracks:
-                x1, y1, x2, y2 = t.bbox
-                cx = (x1 + x2) / 2
-                cy = (y1 + y2) / 2
-
-                was_inside = inside_state.get(t.track_id, False)
-                now_inside = point_inside_rect(cx, cy, roi.coordinates)
-                prev_pos = last_pos.get(t.track_id)
-                direction = models.EntryExit.entry
-                if prev_pos:
-                    dir_str = determine_entry_exit(prev_pos, (cx, cy), roi.coordinates)
-                    direction = models.EntryExit.entry if dir_str == "ENTRY" else models.EntryExit.exit
-                last_pos[t.track_id] = (cx, cy)
-                inside_state[t.track_id] = now_inside
-
-                # Trigger when the centroid crosses the ROI midline (more stable than simple enter)
-                mid_cross = False
-                if prev_pos:
-                    _, prev_y = prev_pos
-                    (x1_roi, y1_roi), (x2_roi, y2_roi) = roi.coordinates
-                    mid_y = (y1_roi + y2_roi) / 2.0
-                    mid_cross = (prev_y <= mid_y < cy) or (prev_y >= mid_y > cy)
-
-                should_emit = mid_cross or ((not was_inside) and now_inside)
-                if should_emit:
-                    now = time.time()
-                    key = (camera.id, t.track_id)
-                    last_time = _last_event_time.get(key, 0)
-                    # Debounce per track
-                    if now - last_time < 2:
-                        continue
-                    _last_event_time[key] = now
-
-                    # Save snapshot image (with rectangle overlay)
-                    snapshot_dir = "/tmp/event_snapshots"
-                    Path(snapshot_dir).mkdir(parents=True, exist_ok=True)
-                    snapshot_filename = f"{uuid.uuid4()}.jpg"
-                    snapshot_path = os.path.join(snapshot_dir, snapshot_filename)
-                    frame_copy = frame.copy()
-                    cv2.rectangle(frame_copy, (int(x1), int(y1)), (int(x2), int(y2)), (0, 255, 0), 2)
-                    cv2.imwrite(snapshot_path, frame_copy)
-
-                    # Upload to MinIO
-                    minio_service = MinioService()
-                    object_name = minio_service.upload_file(snapshot_path, snapshot_filename)
-                    snapshot_url = minio_service.public_url(object_name)
-
-                    # Map cls name to enum
-                    vehicle_enum = None
-                    cls_lower = t.cls_name.lower()
-                    mapping = {
-                        "truck": models.VehicleType.truck,
-                        "dumper": models.VehicleType.dumper,
-                        "car/4-wheeler": models.VehicleType.car,
-                        "car": models.VehicleType.car,
-                        "bike/2-wheeler": models.VehicleType.bike,
-                        "bike": models.VehicleType.bike,
-                        "tractor": models.VehicleType.tractor,
-                        "trolley": models.VehicleType.tractor,
-                    }
-                    vehicle_enum = mapping.get(cls_lower, None)
-
-                    plate, barcode = _identify_vehicle(frame, (x1, y1, x2, y2), settings.IDENT_MODE, plate_detector, settings.PLATE_CONF)
-
-                    # Material/load estimation from crop
-                    crop_for_load = frame[max(0, int(y1)):max(int(y1), int(y2)), max(0, int(x1)):max(int(x1), int(x2))]
-                    est = mat_estimator.estimate(crop_for_load)
-                    # Save load crop
-                    load_crop_path = None
-                    try:
-                        load_crop_dir = "/tmp/load_crops"
-                        Path(load_crop_dir).mkdir(parents=True, exist_ok=True)
-                        load_crop_filename = f"load_{uuid.uuid4()}.jpg"
-                        local_load_crop = os.path.join(load_crop_dir, load_crop_filename)
-                        cv2.imwrite(local_load_crop, crop_for_load)
-                        load_crop_obj = minio_service.upload_file(local_load_crop, load_crop_filename)
-                        load_crop_path = minio_service.public_url(load_crop_obj)
-                    except Exception as exc:
-                        print(f"load crop save failed: {exc}")
-
-                    event = models.Event(
-                        gate_id=camera.gate_id,
-                        camera_id=camera.id,
-                        entry_exit=direction,
-                        vehicle_type=vehicle_enum,
-                        track_id=t.track_id,
-                        confidence=t.conf,
-                        timestamp=datetime.utcnow(),
-                        snapshot_path=snapshot_url,
-                        plate_number=plate,
-                        barcode_value=barcode,
-                        material_type=est.material_type,
-                        material_confidence=est.material_confidence,
-                        load_percentage=est.load_percentage,
-                        load_label=est.load_label,
-                        load_crop_path=load_crop_path,
-                    )
-                    db.add(event)
-                    db.commit()
-                    db.refresh(event)
-                    m.inc_event(camera.gate_id, vehicle_enum.value if vehicle_enum else "Unknown", event.entry_exit.value)
-                    send_notification.delay(event.id)
-            time.sleep(0.05)
+    db: Session = SessionLocal()
+    try:
+        db.add_all(events)
+        db.flush()
+        # Read what is needed before commit expires the instances (no per-event refresh)
+        emitted = [
+            (e.id, e.gate_id, e.vehicle_type.value if e.vehicle_type else "Unknown", e.entry_exit.value)
+            for e in events
+        ]
+        db.commit()
+        for event_id, gate_id, vehicle_type, direction in emitted:
+            m.inc_event(gate_id, vehicle_type, direction)
+            send_notification.delay(event_id)
     finally:
         db.close()
 
 
+@dataclass(frozen=True)
+class _Rule:
+    """Detached copy of an enabled NotificationRule, safe to cache across sessions."""
+
+    channel: NotificationChannel
+    min_confidence: int
+    directions: tuple[str, ...]
+    vehicle_types: tuple[str, ...]
+    recipients: tuple[str, ...]
+
+
+# (gate_id, rules version) -> enabled rules; the version is bumped by the rules API
+_rules_cache: TTLCache = TTLCache(maxsize=512, ttl=60)
+# (model, id) -> display name of a gate or camera
+_names_cache: TTLCache = TTLCache(maxsize=1024, ttl=60)
+_cache_lock = threading.Lock()
+
+
+def _rules_for_gate(db: Session, gate_id: int) -> tuple[_Rule, ...]:
+    """Enabled notification rules of a gate, cached until they change or for 60 s."""
+    key = (gate_id, notify_state.rules_version())
+    with _cache_lock:
+        rules = _rules_cache.get(key)
+    if rules is None:
+        rules = tuple(
+            _Rule(
+                channel=r.channel,
+                min_confidence=r.min_confidence,
+                directions=tuple(r.directions or ()),
+                vehicle_types=tuple(r.vehicle_types or ()),
+                recipients=tuple(r.recipient_list()),
+            )
+            for r in db.query(NotificationRule).filter(
+                NotificationRule.gate_id == gate_id,
+                NotificationRule.enabled == True,
+            )
+        )
+        with _cache_lock:
+            _rules_cache[key] = rules
+    return rules
+
+
+def _cached_name(db: Session, model, obj_id: int) -> str | None:
+    """``name`` of a Gate/Camera row, cached for 60 s."""
+    key = (model.__name__, obj_id)
+    with _cache_lock:
+        name = _names_cache.get(key)
+    if name is None:
+        obj = db.get(model, obj_id)
+        if obj is None:
+            return None
+        name = obj.name
+        with _cache_lock:
+            _names_cache[key] = name
+    return name
+
+
 @celery_app.task(name="app.workers.tasks.send_notification")
 def send_notification(event_id: int) -> None:
     """Send an email/SMS notification for a new event.
@@ -257,50 +660,42 @@ def send_notification(event_id: int) -> None:
         event = db.query(models.Event).filter(models.Event.id == event_id).first()
         if not event:
             return
-        camera = db.query(models.Camera).filter(models.Camera.id == event.camera_id).first()
-        gate = db.query(models.Gate).filter(models.Gate.id == event.gate_id).first()
         # Apply per-gate rules
-        rules = db.query(NotificationRule).filter(
-            NotificationRule.gate_id == event.gate_id,
-            NotificationRule.enabled == True,
-            NotificationRule.min_confidence <= (event.confidence or 0),
-        ).all()
+        rules = [
+            r
+            for r in _rules_for_gate(db, event.gate_id)
+            if r.min_confidence <= (event.confidence or 0)
+        ]
         if not rules:
             return
         # filter by direction/vehicle type if set
         filtered_rules = []
         for r in rules:
-            if r.directions:
-                dirs = [d.strip().upper() for d in r.directions.split(",") if d.strip()]
-                if event.entry_exit.value.upper() not in dirs:
-                    continue
-            if r.vehicle_types:
-                vts = [v.strip().lower() for v in r.vehicle_types.split(",") if v.strip()]
-                if event.vehicle_type and event.vehicle_type.value.lower() not in vts:
-                    continue
+            # Arrays are normalised (upper/lower case) when the rule is saved
+            if r.directions and event.entry_exit.value.upper() not in r.directions:
+                continue
+            if r.vehicle_types and event.vehicle_type and event.vehicle_type.value.lower() not in r.vehicle_types:
+                continue
             filtered_rules.append(r)
         rules = filtered_rules
         if not rules:
             return
-        # Debounce per (gate, channel)
-        now = time.time()
-        rules_debounced = []
-        for r in rules:
-            key = (event.gate_id, r.channel.value)
-            last = _last_notify_time.get(key, 0)
-            if now - last < settings.NOTIFY_DEBOUNCE_SECONDS:
-                continue
-            _last_notify_time[key] = now
-            rules_debounced.append(r)
-        rules = rules_debounced
+        # Debounce per (gate, channel), shared by all worker processes
+        rules = [
+            r
+            for r in rules
+            if notify_state.try_acquire_debounce(event.gate_id, r.channel.value, settings.NOTIFY_DEBOUNCE_SECONDS)
+        ]
         if not rules:
             return
+        gate_name = _cached_name(db, models.Gate, event.gate_id)
+        camera_name = _cached_name(db, models.Camera, event.camera_id)
         # Compose email
-        subject = f"Vehicle {event.entry_exit.value} at {gate.name}"
+        subject = f"Vehicle {event.entry_exit.value} at {gate_name}"
         body = (
             f"Time: {event.timestamp}\n"
-            f"Gate: {gate.name}\n"
-            f"Camera: {camera.name}\n"
+            f"Gate: {gate_name}\n"
+            f"Camera: {camera_name}\n"
             f"Type: {event.vehicle_type.value if event.vehicle_type else 'Unknown'}\n"
             f"Snapshot: {event.snapshot_path}\n"
         )
@@ -314,11 +709,11 @@ def send_notification(event_id: int) -> None:
         recipients_push = []
         for r in rules:
             if r.channel == NotificationChannel.email:
-                recipients_email.extend(r.recipient_list())
+                recipients_email.extend(r.recipients)
             if r.channel == NotificationChannel.sms:
-                recipients_sms.extend(r.recipient_list())
+                recipients_sms.extend(r.recipients)
             if r.channel == NotificationChannel.push:
-                recipients_push.extend(r.recipient_list())
+                recipients_push.extend(r.recipients)
 
         send_email(subject, body, recipients_email or None)
         send_sms(body, recipients_sms or None, has_sms)
@@ -327,12 +722,38 @@ def send_notification(event_id: int) -> None:
         db.close()
 
 
+_smtp_local = threading.local()
+
+
+def _smtp_send(msg) -> None:
+    """Send ``msg`` over this thread's cached SMTP connection, reconnecting once if it dropped."""
+    import smtplib
+
+    settings = get_settings()
+    for attempt in range(2):
+        server = getattr(_smtp_local, "server", None)
+        if server is None:
+            server = smtplib.SMTP(settings.smtp_host, settings.smtp_port, timeout=10)
+            _smtp_local.server = server
+        try:
+            server.send_message(msg)
+            return
+        except (smtplib.SMTPServerDisconnected, ConnectionError):
+            _smtp_local.server = None
+            try:
+                server.close()
+            except Exception:
+                pass
+            if attempt:
+                raise
+
+
 def send_email(subject: str, body: str, recipients: list[str] | None = None) -> None:
     """Send an email via SMTP using settings.
 
-    For local development this will deliver to the MailHog service.
+    For local development this will deliver to the MailHog service. The
+    SMTP connection is kept open per worker thread and reused.
     """
-    import smtplib
     from email.mime.text import MIMEText
 
     settings = get_settings()
@@ -341,28 +762,37 @@ def send_email(subject: str, body: str, recipients: list[str] | None = None) ->
     msg["From"] = settings.mail_from
     msg["To"] = ",".join(recipients) if recipients else "recipient@example.com"
     try:
-        with smtplib.SMTP(settings.smtp_host, settings.smtp_port) as server:
-            server.send_message(msg)
+        _smtp_send(msg)
         m.inc_notification("email", "success")
     except Exception as exc:
         print(f"Failed to send email: {exc}")
         m.inc_notification("email", "failure")
 
 
+@lru_cache(maxsize=1)
+def _twilio_client(account_sid: str, auth_token: str):
+    from twilio.rest import Client
+
+    return Client(account_sid, auth_token)
+
+
+# Twilio calls for one message's recipients go out concurrently
+_sms_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="sms")
+
+
 def send_sms(message: str, recipients: list[str] | None = None, enabled: bool = True) -> None:
     """Send SMS via Twilio if configured, otherwise log."""
     cfg = get_settings()
     dest_list = recipients or ([cfg.NOTIFY_SMS_TO] if cfg.NOTIFY_SMS_TO else [])
     if enabled and cfg.TWILIO_ACCOUNT_SID and cfg.TWILIO_AUTH_TOKEN and cfg.TWILIO_FROM_NUMBER and dest_list:
         try:
-            from twilio.rest import Client
-            client = Client(cfg.TWILIO_ACCOUNT_SID, cfg.TWILIO_AUTH_TOKEN)
-            for dest in dest_list:
-                client.messages.create(
-                    body=message,
-                    from_=cfg.TWILIO_FROM_NUMBER,
-                    to=dest,
+            client = _twilio_client(cfg.TWILIO_ACCOUNT_SID, cfg.TWILIO_AUTH_TOKEN)
+            list(
+                _sms_pool.map(
+                    lambda dest: client.messages.create(body=message, from_=cfg.TWILIO_FROM_NUMBER, to=dest),
+                    dest_list,
                 )
+            )
             m.inc_notification("sms", "success")
             return
         except Exception as exc:
@@ -372,6 +802,20 @@ def send_sms(message: str, recipients: list[str] | None = None, enabled: bool =
     m.inc_notification("sms", "stub")
 
 
+# FCM accepts at most this many registration_ids per request
+_FCM_MAX_TOKENS = 1000
+
+
+@lru_cache(maxsize=1)
+def _push_session() -> requests.Session:
+    """Keep-alive HTTP session for FCM; connection errors are retried, sends are not."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_maxsize=32, max_retries=Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.2))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
 def send_push(message: str, recipients: list[str] | None = None, enabled: bool = True) -> None:
     """Send push notifications via FCM legacy API if configured."""
     cfg = get_settings()
@@ -386,21 +830,22 @@ def send_push(message: str, recipients: list[str] | None = None, enabled: bool =
         "Authorization": f"key={cfg.FCM_SERVER_KEY}",
         "Content-Type": "application/json",
     }
-    payload = {
-        "registration_ids": tokens,
-        "notification": {
-            "title": "Vehicle event",
-            "body": message[:200],
-        },
-        "data": {"type": "vehicle_event"},
-    }
-    try:
-        resp = requests.post(cfg.FCM_ENDPOINT, json=payload, headers=headers, timeout=5)
-        if resp.ok:
-            m.inc_notification("push", "success")
-        else:
-            print(f"FCM push failed: {resp.status_code} {resp.text}")
+    for i in range(0, len(tokens), _FCM_MAX_TOKENS):
+        payload = {
+            "registration_ids": tokens[i : i + _FCM_MAX_TOKENS],
+            "notification": {
+                "title": "Vehicle event",
+                "body": message[:200],
+            },
+            "data": {"type": "vehicle_event"},
+        }
+        try:
+            resp = _push_session().post(cfg.FCM_ENDPOINT, json=payload, headers=headers, timeout=5)
+            if resp.ok:
+                m.inc_notification("push", "success")
+            else:
+                print(f"FCM push failed: {resp.status_code} {resp.text}")
+                m.inc_notification("push", "failure")
+        except Exception as exc:
+            print(f"FCM push exception: {exc}")
             m.inc_notification("push", "failure")
-    except Exception as exc:
-        print(f"FCM push exception: {exc}")
-        m.inc_notification("push", "failure")
@@ -6,6 +6,7 @@ import Loader from '../components/Loader';
 
 const Dashboard = () => {
   const [events, setEvents] = useState([]);
+  const [summary, setSummary] = useState({ total: 0, avg_load: 0, vehicle_types: [], materials: [] });
   const [snapshotUrl, setSnapshotUrl] = useState('');
   const [cameras, setCameras] = useState([]);
   const [selectedCamera, setSelectedCamera] = useState(1);
@@ -32,8 +33,14 @@ const Dashboard = () => {
     if (filters.gate_id) params.gate_id = filters.gate_id;
     if (filters.vehicle_type) params.vehicle_type = filters.vehicle_type;
     if (filters.entry_exit) params.entry_exit = filters.entry_exit;
-    const res = await api.get('/events/', { params });
-    setEvents(res.data);
+    // Charts and totals come from the server-side summary; only the few
+    // events shown in the recent list are fetched as rows
+    const [summaryRes, recentRes] = await Promise.all([
+      api.get('/events/summary', { params }),
+      api.get('/events/', { params: { ...params, limit: 6 } }),
+    ]);
+    setSummary(summaryRes.data);
+    setEvents(recentRes.data);
   };
 
   useEffect(() => {
@@ -103,32 +110,17 @@ const Dashboard = () => {
     setLiveUrl(`${base}/cameras/${selectedCamera}/mjpeg_live?token=${token}`);
   }, [selectedCamera]);
 
-  const chartData = useMemo(() => {
-    const counts = {};
-    events.forEach((ev) => {
-      const type = ev.vehicle_type || 'Unknown';
-      counts[type] = (counts[type] || 0) + 1;
-    });
-    return Object.keys(counts).map((key) => ({ name: key, count: counts[key] }));
-  }, [events]);
+  const chartData = summary.vehicle_types;
 
-  const materialData = useMemo(() => {
-    const counts = {};
-    events.forEach((ev) => {
-      const mat = ev.material_type || 'Unknown';
-      counts[mat] = (counts[mat] || 0) + 1;
-    });
-    return Object.keys(counts).map((key) => ({ name: key, value: counts[key] }));
-  }, [events]);
+  const materialData = useMemo(
+    () => summary.materials.map(({ name, count }) => ({ name, value: count })),
+    [summary],
+  );
 
-  const avgLoad = useMemo(() => {
-    const loads = events.map((e) => Number(e.load_percentage || 0)).filter((n) => !Number.isNaN(n));
-    if (!loads.length) return 0;
-    return loads.reduce((a, b) => a + b, 0) / loads.length;
-  }, [events]);
+  const avgLoad = summary.avg_load;
 
   const recentEvents = events.slice(0, 6);
-  const totalEvents = events.length;
+  const totalEvents = summary.total;
   const lastSnapshot = recentEvents[0]?.timestamp;
 
   return (
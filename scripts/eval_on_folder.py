@@ -10,6 +10,7 @@ hand-check accuracy and adjust thresholds.
 
 import argparse
 import csv
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import cv2
@@ -29,40 +30,51 @@ def main():
     parser.add_argument("--out", default="eval_results.csv", help="Output CSV")
     parser.add_argument("--conf", type=float, default=0.35, help="Vehicle conf threshold")
     parser.add_argument("--plate_conf", type=float, default=0.35, help="Plate conf threshold")
+    parser.add_argument("--batch", type=int, default=16, help="Images per detector batch")
     args = parser.parse_args()
 
     yolo = YOLODetector(args.yolo, conf_threshold=args.conf, iou_threshold=0.45)
     plate = PlateDetector(args.plate, conf_threshold=args.plate_conf, iou_threshold=0.45) if args.plate else None
     tracker = TrackManager(iou_threshold=0.35, max_age=0)
 
-    rows = []
-    imgs = sorted(Path(args.images).glob("*.*"))
-    for img_path in imgs:
-        frame = cv2.imread(str(img_path))
-        if frame is None:
-            continue
-        dets = [{"bbox": d.bbox, "cls_name": d.cls_name, "conf": d.conf} for d in yolo.detect(frame)]
-        tracks = tracker.update(dets)
-        for t in tracks:
-            x1, y1, x2, y2 = map(int, t.bbox)
-            crop = frame[y1:y2, x1:x2]
-            plate_txt, barcode_txt = identify_from_crop(crop, args.ident_mode, plate_detector=plate, plate_conf=args.plate_conf)
-            rows.append({
-                "image": img_path.name,
-                "track_id": t.track_id,
-                "cls_name": t.cls_name,
-                "conf": t.conf,
-                "bbox": f"{x1},{y1},{x2},{y2}",
-                "plate": plate_txt or "",
-                "barcode": barcode_txt or "",
-            })
-
+    fieldnames = ["image", "track_id", "cls_name", "conf", "bbox", "plate", "barcode"]
+    n_rows = 0
     with open(args.out, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=["image", "track_id", "cls_name", "conf", "bbox", "plate", "barcode"])
+        # Rows are written as they are produced, so memory does not grow with the folder size
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
         writer.writeheader()
-        for r in rows:
-            writer.writerow(r)
-    print(f"Wrote {len(rows)} detections to {args.out}")
+        imgs = sorted(Path(args.images).glob("*.*"))
+        batches = [imgs[i : i + args.batch] for i in range(0, len(imgs), args.batch)]
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            # Decode the next batch on the pool while the current one is detected
+            next_reads = [pool.submit(cv2.imread, str(p)) for p in batches[0]] if batches else []
+            for k, batch in enumerate(batches):
+                reads = next_reads
+                if k + 1 < len(batches):
+                    next_reads = [pool.submit(cv2.imread, str(p)) for p in batches[k + 1]]
+                loaded = [(p, r.result()) for p, r in zip(batch, reads)]
+                loaded = [(p, frame) for p, frame in loaded if frame is not None]
+                if not loaded:
+                    continue
+                batch_dets = yolo.detect_batch([frame for _, frame in loaded])
+                for (img_path, frame), frame_dets in zip(loaded, batch_dets):
+                    dets = [{"bbox": d.bbox, "cls_name": d.cls_name, "conf": d.conf} for d in frame_dets]
+                    tracks = tracker.update(dets)
+                    for t in tracks:
+                        x1, y1, x2, y2 = map(int, t.bbox)
+                        crop = frame[y1:y2, x1:x2]
+                        plate_txt, barcode_txt = identify_from_crop(crop, args.ident_mode, plate_detector=plate, plate_conf=args.plate_conf)
+                        writer.writerow({
+                            "image": img_path.name,
+                            "track_id": t.track_id,
+                            "cls_name": t.cls_name,
+                            "conf": t.conf,
+                            "bbox": f"{x1},{y1},{x2},{y2}",
+                            "plate": plate_txt or "",
+                            "barcode": barcode_txt or "",
+                        })
+                        n_rows += 1
+    print(f"Wrote {n_rows} detections to {args.out}")
 
 
 if __name__ == "__main__":
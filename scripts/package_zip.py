@@ -4,8 +4,9 @@ Usage:
     python scripts/package_zip.py
 
 This script creates a ZIP file under ``dist/`` named
-``cctv-vehicle-analytics.zip`` containing all files in the project
-directory.  The zip file can be provided as the final deliverable.
+``cctv-vehicle-analytics.zip`` containing the files in the project
+directory, minus build output, git data, dependencies and caches
+(``EXCLUDED_DIRS``).  The zip file can be provided as the final deliverable.
 """
 
 import os
@@ -15,17 +16,32 @@ ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
 OUTPUT_DIR = os.path.join(ROOT_DIR, 'dist')
 OUTPUT_FILE = os.path.join(OUTPUT_DIR, 'cctv-vehicle-analytics.zip')
 
+# Build output (including the archive itself), VCS data, dependencies and caches
+EXCLUDED_DIRS = {
+    'dist', '.git', 'node_modules', '__pycache__', '.venv', '.mypy_cache', '.pytest_cache',
+}
+
+# Already-compressed formats gain nothing from deflate; store them as-is
+STORED_EXTENSIONS = {
+    '.jpg', '.jpeg', '.png', '.webp', '.mp4', '.mkv', '.avi',
+    '.onnx', '.pt', '.whl', '.zip', '.gz', '.tgz', '.bz2', '.xz', '.zst',
+}
+
 
 def zipdir(path: str, ziph: zipfile.ZipFile) -> None:
     """Recursively add a directory to a zip archive."""
     for root, dirs, files in os.walk(path):
+        # Prune excluded subtrees so they are never walked
+        dirs[:] = [d for d in dirs if d not in EXCLUDED_DIRS]
         for file in files:
-            filepath = os.path.join(root, file)
-            # Skip the dist folder itself
-            if '/dist/' in filepath:
+            if file.endswith('.pyc'):
                 continue
+            filepath = os.path.join(root, file)
             arcname = os.path.relpath(filepath, start=ROOT_DIR)
-            ziph.write(filepath, arcname)
+            if os.path.splitext(file)[1].lower() in STORED_EXTENSIONS:
+                ziph.write(filepath, arcname, compress_type=zipfile.ZIP_STORED)
+            else:
+                ziph.write(filepath, arcname)
 
 
 def main() -> None:
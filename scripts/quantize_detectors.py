@@ -0,0 +1,90 @@
+"""
+Offline static INT8 quantisation for the YOLO and plate detectors.
+
+Usage:
+  python scripts/quantize_detectors.py --images ./samples /models/yolov8n.onnx /models/plate.onnx
+
+Activations are calibrated on up to ``--count`` images from the folder
+(the same kind of folder ``eval_on_folder.py`` takes), preprocessed exactly
+as ``ImageModelRunner`` feeds the model. Writes ``<model>.int8.onnx`` in QDQ
+format next to each input; the detectors load that variant automatically
+when it exists and fall back to the FP32 model otherwise.
+"""
+
+import argparse
+import tempfile
+from pathlib import Path
+
+import cv2
+import onnx
+from onnxruntime.quantization import (
+    CalibrationDataReader,
+    CalibrationMethod,
+    QuantFormat,
+    QuantType,
+    quantize_static,
+)
+from onnxruntime.quantization.shape_inference import quant_pre_process
+
+from app.services.ort_session import int8_model_path
+
+
+class _FolderReader(CalibrationDataReader):
+    """Feeds calibration images one at a time as (1,3,H,W) RGB float blobs."""
+
+    def __init__(self, image_paths, input_name: str, size):
+        self._paths = iter(image_paths)
+        self._input_name = input_name
+        self._size = size
+
+    def get_next(self):
+        for path in self._paths:
+            frame = cv2.imread(str(path))
+            if frame is None:
+                continue
+            blob = cv2.dnn.blobFromImage(frame, 1 / 255.0, self._size, swapRB=True, crop=False)
+            return {self._input_name: blob}
+        return None
+
+
+def _input_spec(model_path: str):
+    graph = onnx.load(model_path, load_external_data=False).graph
+    initializers = {init.name for init in graph.initializer}
+    inp = next(i for i in graph.input if i.name not in initializers)
+    dims = inp.type.tensor_type.shape.dim
+    h, w = (d.dim_value or 640 for d in dims[2:4])
+    return inp.name, (w, h)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("models", nargs="+", help="FP32 ONNX detector paths")
+    parser.add_argument("--images", required=True, help="Folder of calibration images")
+    parser.add_argument("--count", type=int, default=300, help="Calibration images to use")
+    args = parser.parse_args()
+
+    images = sorted(Path(args.images).glob("*.*"))[: args.count]
+    if not images:
+        parser.error(f"no images found in {args.images}")
+    for model in args.models:
+        out = int8_model_path(model)
+        input_name, size = _input_spec(model)
+        with tempfile.TemporaryDirectory() as tmp:
+            # Shape inference + graph cleanup so every activation gets a QDQ pair
+            prepared = str(Path(tmp) / "prepared.onnx")
+            quant_pre_process(model, prepared)
+            quantize_static(
+                prepared,
+                out,
+                _FolderReader(images, input_name, size),
+                quant_format=QuantFormat.QDQ,
+                activation_type=QuantType.QUInt8,
+                weight_type=QuantType.QInt8,
+                per_channel=True,
+                calibrate_method=CalibrationMethod.MinMax,
+            )
+        print(f"{model} -> {out} ({Path(out).stat().st_size / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""
+Offline INT8 quantisation for the material/load ONNX models.
+
+Usage:
+  python scripts/quantize_models.py /models/material.onnx /models/load.onnx
+
+Writes ``<model>.int8.onnx`` next to each input using dynamic (weight-only)
+INT8 quantisation. MaterialModelEstimator loads that variant automatically
+when it exists and falls back to the FP32 model otherwise.
+"""
+
+import argparse
+from pathlib import Path
+
+from onnxruntime.quantization import QuantType, quantize_dynamic
+
+from app.services.ort_session import int8_model_path
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("models", nargs="+", help="FP32 ONNX model paths")
+    args = parser.parse_args()
+
+    for model in args.models:
+        out = int8_model_path(model)
+        quantize_dynamic(model, out, weight_type=QuantType.QInt8)
+        print(f"{model} -> {out} ({Path(out).stat().st_size / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()